@@ -36,6 +36,8 @@ from utils.dependencies import check_tool, check_all_dependencies, TOOL_DEPENDEN
 from utils.process import cleanup_stale_processes
 from utils.sdr import SDRFactory
 from utils.cleanup import DataStore, cleanup_manager
+from utils.json_codec import ORJSON_AVAILABLE
+from utils.quart_json import OrjsonProvider
 from utils.constants import (
     MAX_AIRCRAFT_AGE_SECONDS,
     MAX_WIFI_NETWORK_AGE_SECONDS,
@@ -56,6 +58,8 @@ logger = logging.getLogger('valentine.database')
 # Create Quart app (async-native Flask replacement)
 app = Quart(__name__)
 app.secret_key = SECRET_KEY  # Generated randomly or from VALENTINE_SECRET_KEY env var
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # Set up rate limiting (Quart-native rate limiter)
 rate_limiter = RateLimiter(app)
@@ -350,16 +354,21 @@ async def logout():
 # ============================================
 # API TOKEN HELPERS
 # ============================================
-import hashlib as _hashlib
 import hmac as _hmac
+from functools import lru_cache as _lru_cache
+
+@_lru_cache(maxsize=64)
+def _derive_api_token(secret: str | bytes, username: str) -> str:
+    """HMAC a username with the secret; keyed on the secret so rotation invalidates."""
+    return _hmac.digest(
+        secret.encode() if isinstance(secret, str) else secret,
+        f'valentine-api-token:{username}'.encode(),
+        'sha256',
+    ).hex()
 
 def _generate_api_token(username: str) -> str:
     """Derive a per-user API token from the app secret key."""
-    return _hmac.new(
-        app.secret_key.encode() if isinstance(app.secret_key, str) else app.secret_key,
-        f'valentine-api-token:{username}'.encode(),
-        _hashlib.sha256
-    ).hexdigest()
+    return _derive_api_token(app.secret_key, username)
 
 def _verify_api_token(token: str) -> bool:
     """Verify an API token against all known users."""
@@ -1133,6 +1142,8 @@ def main() -> None:
         cleanup_all_processes()
         from utils.database import close_db
         close_db()
+        from utils.agent_client import close_http_client
+        await close_http_client()
         logger.info("Shutdown cleanup complete.")
 
 # Quart uses Hypercorn as its ASGI server (replaces Flask's threaded Werkzeug).
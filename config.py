@@ -256,6 +256,10 @@ UAT_AUTO_START = _get_env_bool('UAT_AUTO_START', False)
 UAT_DEFAULT_DEVICE = _get_env_int('UAT_DEFAULT_DEVICE', 1)
 UAT_DEFAULT_GAIN = _get_env('UAT_DEFAULT_GAIN', '40')
 
+# Controller (remote agent push ingestion) settings
+CONTROLLER_INGEST_BATCH_SIZE = _get_env_int('CONTROLLER_INGEST_BATCH_SIZE', 64)
+CONTROLLER_INGEST_FLUSH_INTERVAL = _get_env_float('CONTROLLER_INGEST_FLUSH_INTERVAL', 0.005)
+
 # Observer location settings
 SHARED_OBSERVER_LOCATION_ENABLED = _get_env_bool('SHARED_OBSERVER_LOCATION', True)
 DEFAULT_LATITUDE = _get_env_float('DEFAULT_LAT', 0.0)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import os
 import json
+from functools import lru_cache
 
 logger = logging.getLogger('valentine.oui')
 
@@ -22,9 +23,42 @@ def load_oui_database() -> dict[str, str] | None:
 
 
 def get_manufacturer(mac: str) -> str:
-    """Look up manufacturer from MAC address OUI."""
-    prefix = mac[:8].upper()
-    return OUI_DATABASE.get(prefix, 'Unknown')
+    """Look up manufacturer from MAC address OUI.
+
+    Longer (MA-M / MA-S) prefixes win over the 24-bit MA-L prefix. Only
+    prefix lengths actually present in OUI_DATABASE are probed.
+    """
+    # Upper-case only the prefix rather than the whole address
+    return _lookup_prefix(mac[:_MAX_PREFIX_LEN].upper())
+
+
+@lru_cache(maxsize=8192)
+def _lookup_prefix(prefix: str) -> str:
+    """Resolve a normalized address prefix; addresses sharing it share a cache entry."""
+    for length, table in _OUI_BUCKETS:
+        manufacturer = table.get(prefix[:length])
+        if manufacturer is not None:
+            return manufacturer
+    return 'Unknown'
+
+
+def reindex_oui_database() -> None:
+    """Rebuild the per-prefix-length lookup tables from OUI_DATABASE.
+
+    Must be called after OUI_DATABASE is modified in place.
+    """
+    global _OUI_BUCKETS, _MAX_PREFIX_LEN
+    buckets: dict[int, dict[str, str]] = {}
+    for prefix, manufacturer in OUI_DATABASE.items():
+        buckets.setdefault(len(prefix), {})[prefix.upper()] = manufacturer
+    _OUI_BUCKETS = sorted(buckets.items(), reverse=True)
+    _MAX_PREFIX_LEN = _OUI_BUCKETS[0][0] if _OUI_BUCKETS else 0
+    _lookup_prefix.cache_clear()
+
+
+# (prefix length, {prefix: manufacturer}) pairs, longest prefix first
+_OUI_BUCKETS: list[tuple[int, dict[str, str]]] = []
+_MAX_PREFIX_LEN = 0
 
 
 # OUI Database for manufacturer lookup (expanded)
@@ -170,3 +204,5 @@ if _external_oui:
     logger.info(f"Loaded {len(OUI_DATABASE)} entries from oui_database.json")
 else:
     logger.info(f"Using built-in database with {len(OUI_DATABASE)} entries")
+
+reindex_oui_database()
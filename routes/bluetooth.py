@@ -24,7 +24,7 @@ from utils.logging import bluetooth_logger as logger
 from utils.sse import async_sse_stream, async_sse_stream_fanout, format_sse
 from utils.event_pipeline import process_event
 from utils.validation import validate_bluetooth_interface
-from data.oui import OUI_DATABASE, load_oui_database, get_manufacturer
+from data.oui import OUI_DATABASE, load_oui_database, get_manufacturer, reindex_oui_database
 from data.patterns import AIRTAG_PREFIXES, TILE_PREFIXES, SAMSUNG_TRACKER
 from utils.constants import (
     BT_TERMINATE_TIMEOUT,
@@ -332,6 +332,7 @@ async def reload_oui_database_route():
     if new_db:
         OUI_DATABASE.clear()
         OUI_DATABASE.update(new_db)
+        reindex_oui_database()
         return jsonify({'status': 'success', 'entries': len(OUI_DATABASE)})
     return jsonify({'status': 'error', 'message': 'Could not load oui_database.json'})
 
@@ -16,19 +16,23 @@ import queue
 import time
 from datetime import datetime, timezone
 import asyncio
+import hmac
 from typing import Generator
 
 import httpx
 
 from quart import Blueprint, jsonify, request, Response
 
+from config import CONTROLLER_INGEST_BATCH_SIZE, CONTROLLER_INGEST_FLUSH_INTERVAL
 from utils.database import (
     create_agent, get_agent, get_agent_by_name, list_agents,
-    update_agent, delete_agent, store_push_payload, get_recent_payloads
+    update_agent, delete_agent, store_push_payloads, get_recent_payloads,
+    get_payload_version, normalize_payload_timestamp
 )
 from utils.agent_client import (
     AgentClient, AgentHTTPError, AgentConnectionError, create_client_from_agent
 )
+from utils import json_codec
 from utils.sse import async_sse_stream, async_sse_stream_fanout, format_sse
 from utils.trilateration import (
     DeviceLocationTracker, PathLossModel, Trilateration,
@@ -43,6 +47,22 @@ controller_bp = Blueprint('controller', __name__, url_prefix='/controller')
 agent_data_queue: queue.Queue = queue.Queue(maxsize=1000)
 
 
+def _json_response(data: dict, status: int = 200) -> Response:
+    """Build a JSON response using the fast codec (hot-path endpoints)."""
+    return Response(json_codec.dumps_bytes(data), status=status, mimetype='application/json')
+
+
+async def _get_json_body() -> dict | None:
+    """Decode the request body with the fast codec, returning None if invalid."""
+    body = await request.get_data()
+    if not body:
+        return None
+    try:
+        return json_codec.loads(body)
+    except ValueError:
+        return None
+
+
 # =============================================================================
 # Agent CRUD
 # =============================================================================
@@ -53,15 +73,19 @@ async def get_agents():
     active_only = request.args.get('active_only', 'true').lower() == 'true'
     agents = list_agents(active_only=active_only)
 
-    # Optionally refresh status for each agent
+    # Optionally refresh status for each agent (checked concurrently)
     refresh = request.args.get('refresh', 'false').lower() == 'true'
     if refresh:
-        for agent in agents:
+        async def _is_healthy(agent: dict) -> bool:
             try:
                 client = create_client_from_agent(agent)
-                agent['healthy'] = client.health_check()
+                return await client.health_check()
             except Exception:
-                agent['healthy'] = False
+                return False
+
+        healthy = await asyncio.gather(*(_is_healthy(agent) for agent in agents))
+        for agent, is_healthy in zip(agents, healthy):
+            agent['healthy'] = is_healthy
 
     return jsonify({
         'status': 'success',
@@ -120,7 +144,7 @@ async def register_agent():
     capabilities = None
     interfaces = None
     try:
-        caps = client.get_capabilities()
+        caps = await client.get_capabilities()
         capabilities = caps.get('modes', {})
         interfaces = {'devices': caps.get('devices', [])}
     except (AgentHTTPError, AgentConnectionError) as e:
@@ -168,7 +192,7 @@ async def get_agent_detail(agent_id: int):
     if refresh:
         try:
             client = create_client_from_agent(agent)
-            metadata = client.refresh_metadata()
+            metadata = await client.refresh_metadata()
             if metadata['healthy']:
                 caps = metadata['capabilities'] or {}
                 # Store full interfaces structure (wifi, bt, sdr)
@@ -234,7 +258,7 @@ async def refresh_agent_metadata(agent_id: int):
 
     try:
         client = create_client_from_agent(agent)
-        metadata = client.refresh_metadata()
+        metadata = await client.refresh_metadata()
 
         if metadata['healthy']:
             caps = metadata['capabilities'] or {}
@@ -281,7 +305,7 @@ async def get_agent_status(agent_id: int):
 
     try:
         client = create_client_from_agent(agent)
-        status = client.get_status()
+        status = await client.get_status()
         return jsonify({
             'status': 'success',
             'agent_id': agent_id,
@@ -295,58 +319,61 @@ async def get_agent_status(agent_id: int):
         }), 503
 
 
+async def _check_agent_health(agent: dict) -> dict:
+    """Check a single agent's health and running modes."""
+    result = {
+        'id': agent['id'],
+        'name': agent['name'],
+        'healthy': False,
+        'response_time_ms': None,
+        'running_modes': [],
+        'error': None
+    }
+
+    try:
+        client = create_client_from_agent(agent)
+
+        # Time the health check
+        start_time = time.time()
+        is_healthy = await client.health_check()
+        response_time = (time.time() - start_time) * 1000
+
+        result['healthy'] = is_healthy
+        result['response_time_ms'] = round(response_time, 1)
+
+        if is_healthy:
+            # Update last_seen in database
+            update_agent(agent['id'], update_last_seen=True)
+
+            # Also fetch running modes
+            try:
+                status = await client.get_status()
+                result['running_modes'] = status.get('running_modes', [])
+                result['running_modes_detail'] = status.get('running_modes_detail', {})
+            except Exception:
+                pass  # Status fetch is optional
+
+    except AgentConnectionError as e:
+        result['error'] = f'Connection failed: {str(e)}'
+    except AgentHTTPError as e:
+        result['error'] = f'HTTP error: {str(e)}'
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
 @controller_bp.route('/agents/health', methods=['GET'])
 async def check_all_agents_health():
     """
     Check health of all registered agents in one call.
 
-    More efficient than checking each agent individually.
+    More efficient than checking each agent individually; agents are
+    checked concurrently so total latency tracks the slowest agent.
     Returns health status, response time, and running modes for each agent.
     """
     agents_list = list_agents(active_only=True)
-    results = []
-
-    for agent in agents_list:
-        result = {
-            'id': agent['id'],
-            'name': agent['name'],
-            'healthy': False,
-            'response_time_ms': None,
-            'running_modes': [],
-            'error': None
-        }
-
-        try:
-            client = create_client_from_agent(agent)
-
-            # Time the health check
-            start_time = time.time()
-            is_healthy = client.health_check()
-            response_time = (time.time() - start_time) * 1000
-
-            result['healthy'] = is_healthy
-            result['response_time_ms'] = round(response_time, 1)
-
-            if is_healthy:
-                # Update last_seen in database
-                update_agent(agent['id'], update_last_seen=True)
-
-                # Also fetch running modes
-                try:
-                    status = client.get_status()
-                    result['running_modes'] = status.get('running_modes', [])
-                    result['running_modes_detail'] = status.get('running_modes_detail', {})
-                except Exception:
-                    pass  # Status fetch is optional
-
-        except AgentConnectionError as e:
-            result['error'] = f'Connection failed: {str(e)}'
-        except AgentHTTPError as e:
-            result['error'] = f'HTTP error: {str(e)}'
-        except Exception as e:
-            result['error'] = str(e)
-
-        results.append(result)
+    results = await asyncio.gather(*(_check_agent_health(agent) for agent in agents_list))
 
     return jsonify({
         'status': 'success',
@@ -372,7 +399,7 @@ async def proxy_start_mode(agent_id: int, mode: str):
 
     try:
         client = create_client_from_agent(agent)
-        result = client.start_mode(mode, params)
+        result = await client.start_mode(mode, params)
 
         # Update last_seen
         update_agent(agent_id, update_last_seen=True)
@@ -405,7 +432,7 @@ async def proxy_stop_mode(agent_id: int, mode: str):
 
     try:
         client = create_client_from_agent(agent)
-        result = client.stop_mode(mode)
+        result = await client.stop_mode(mode)
 
         update_agent(agent_id, update_last_seen=True)
 
@@ -437,7 +464,7 @@ async def proxy_mode_status(agent_id: int, mode: str):
 
     try:
         client = create_client_from_agent(agent)
-        result = client.get_mode_status(mode)
+        result = await client.get_mode_status(mode)
 
         return jsonify({
             'status': 'success',
@@ -462,7 +489,7 @@ async def proxy_mode_data(agent_id: int, mode: str):
 
     try:
         client = create_client_from_agent(agent)
-        result = client.get_mode_data(mode)
+        result = await client.get_mode_data(mode)
 
         # Tag data with agent info
         result['agent_id'] = agent_id
@@ -539,12 +566,12 @@ async def proxy_wifi_monitor(agent_id: int):
 
     try:
         client = create_client_from_agent(agent)
-        result = client.post('/wifi/monitor', data)
+        result = await client.post('/wifi/monitor', data)
 
         # Refresh agent capabilities after monitor mode toggle so UI stays in sync
         if result.get('status') == 'success':
             try:
-                metadata = client.refresh_metadata()
+                metadata = await client.refresh_metadata()
                 if metadata.get('healthy'):
                     caps = metadata.get('capabilities') or {}
                     agent_interfaces = caps.get('interfaces', {})
@@ -583,6 +610,90 @@ async def proxy_wifi_monitor(agent_id: int):
 # Push Data Ingestion
 # =============================================================================
 
+class IngestBatcher:
+    """
+    Coalesce push payload writes that arrive within a short window.
+
+    Each ingest request submits its record and awaits the assigned payload ID.
+    Records are written in one transaction once the batch fills up or the
+    flush interval elapses, whichever comes first. If that transaction
+    fails, the records are retried one at a time so a bad record only fails
+    its own request.
+    """
+
+    def __init__(self, max_batch: int, flush_interval: float):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, record: dict) -> int:
+        """Queue a payload record and wait for its database ID."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending futures and the flush task belong to the old loop and
+            # can never complete, so start over on the current one
+            self._pending = []
+            self._flush_task = None
+            self._loop = loop
+        future = loop.create_future()
+        self._pending.append((record, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        records = [record for record, _ in batch]
+        try:
+            results: list[int | Exception] = store_push_payloads(records)
+        except Exception as e:
+            if len(records) == 1:
+                results = [e]
+            else:
+                logger.warning("Batched payload write failed, retrying records individually")
+                results = [self._store_one(record) for record in records]
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _store_one(record: dict) -> int | Exception:
+        """Write a single record, returning its ID or the error it raised."""
+        try:
+            return store_push_payloads([record])[0]
+        except Exception as e:
+            return e
+
+
+ingest_batcher = IngestBatcher(
+    max_batch=CONTROLLER_INGEST_BATCH_SIZE,
+    flush_interval=CONTROLLER_INGEST_FLUSH_INTERVAL
+)
+
+
 @controller_bp.route('/api/ingest', methods=['POST'])
 async def ingest_push_data():
     """
@@ -591,6 +702,7 @@ async def ingest_push_data():
     Expected JSON body:
     {
         "agent_name": "sensor-node-1",
+        "agent_id": 3,  (optional, returned by a previous ingest)
         "scan_type": "adsb",
         "interface": "rtlsdr0",
         "payload": {...},
@@ -600,39 +712,50 @@ async def ingest_push_data():
     Expected header:
         X-API-Key: shared-secret (if agent has api_key configured)
     """
-    data = await request.get_json(silent=True)
-    if not data:
-        return jsonify({'status': 'error', 'message': 'No data provided'}), 400
+    data = await _get_json_body()
+    if not data or not isinstance(data, dict):
+        return _json_response({'status': 'error', 'message': 'No data provided'}, 400)
 
     agent_name = data.get('agent_name')
-    if not agent_name:
-        return jsonify({'status': 'error', 'message': 'agent_name required'}), 400
+    agent_id = data.get('agent_id')
+    if not agent_name and agent_id is None:
+        return _json_response({'status': 'error', 'message': 'agent_name required'}, 400)
 
-    # Find agent
-    agent = get_agent_by_name(agent_name)
+    # Find agent - primary-key lookup when the agent sent its cached ID
+    if agent_id is not None:
+        try:
+            agent = get_agent(int(agent_id))
+        except (TypeError, ValueError):
+            agent = None
+        if agent and agent_name and agent['name'] != agent_name:
+            agent = None
+    else:
+        agent = get_agent_by_name(agent_name)
     if not agent:
-        return jsonify({'status': 'error', 'message': 'Unknown agent'}), 401
+        return _json_response({'status': 'error', 'message': 'Unknown agent'}, 401)
+    agent_name = agent['name']
 
     # Validate API key if configured
     if agent.get('api_key'):
         provided_key = request.headers.get('X-API-Key', '')
-        if provided_key != agent['api_key']:
+        if not hmac.compare_digest(provided_key.encode('utf-8'), agent['api_key'].encode('utf-8')):
             logger.warning(f"Invalid API key from agent {agent_name}")
-            return jsonify({'status': 'error', 'message': 'Invalid API key'}), 401
+            return _json_response({'status': 'error', 'message': 'Invalid API key'}, 401)
 
     # Store payload
     try:
-        payload_id = store_push_payload(
-            agent_id=agent['id'],
-            scan_type=data.get('scan_type', 'unknown'),
-            payload=data.get('payload', {}),
-            interface=data.get('interface'),
-            received_at=data.get('received_at')
-        )
+        payload_id = await ingest_batcher.submit({
+            'agent_id': agent['id'],
+            'scan_type': data.get('scan_type', 'unknown'),
+            'payload': data.get('payload', {}),
+            'interface': data.get('interface'),
+            'received_at': data.get('received_at')
+        })
 
         # Emit to SSE stream
         try:
-            agent_data_queue.put_nowait({
+            # Encode once here rather than once per SSE subscriber
+            agent_data_queue.put_nowait(json_codec.dumps({
                 'type': 'agent_data',
                 'agent_id': agent['id'],
                 'agent_name': agent_name,
@@ -640,38 +763,68 @@ async def ingest_push_data():
                 'interface': data.get('interface'),
                 'payload': data.get('payload'),
                 'received_at': data.get('received_at') or datetime.now(timezone.utc).isoformat()
-            })
+            }))
         except queue.Full:
             logger.warning("Agent data queue full, data may be lost")
 
-        return jsonify({
+        return _json_response({
             'status': 'accepted',
-            'payload_id': payload_id
-        }), 202
+            'payload_id': payload_id,
+            'agent_id': agent['id']
+        }, 202)
 
     except Exception as e:
         logger.exception("Failed to store push payload")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return _json_response({'status': 'error', 'message': str(e)}, 500)
 
 
 @controller_bp.route('/api/payloads', methods=['GET'])
 async def get_payloads():
-    """Get recent push payloads."""
+    """
+    Get recent push payloads.
+
+    Query params:
+        agent_id: filter by agent
+        scan_type: filter by scan type
+        limit: maximum rows (default 100, max 1000)
+        since: ISO-8601 timestamp; only payloads received at or after it
+
+    Supports conditional GET: the ETag changes only when payloads for the
+    requested agent change, so pollers get a 304 after a small version
+    lookup instead of the payload query.
+    """
     agent_id = request.args.get('agent_id', type=int)
     scan_type = request.args.get('scan_type')
-    limit = request.args.get('limit', 100, type=int)
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    since = request.args.get('since')
+
+    if since is not None:
+        try:
+            since = normalize_payload_timestamp(since)
+        except ValueError:
+            return _json_response({'status': 'error', 'message': 'Invalid since timestamp'}, 400)
+
+    # Versions come from the database, so every worker and restart agrees
+    etag = f'{agent_id}-{scan_type}-{limit}-{since}-{get_payload_version(agent_id)}'
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
 
     payloads = get_recent_payloads(
         agent_id=agent_id,
         scan_type=scan_type,
-        limit=min(limit, 1000)
+        limit=limit,
+        since=since
     )
 
-    return jsonify({
+    response = _json_response({
         'status': 'success',
         'payloads': payloads,
         'count': len(payloads)
     })
+    response.set_etag(etag, weak=True)
+    return response
 
 
 # =============================================================================
@@ -30,6 +30,7 @@ from utils.constants import (
     SSE_KEEPALIVE_INTERVAL,
     SSE_QUEUE_TIMEOUT,
     WIFI_CSV_PARSE_INTERVAL,
+    WIFI_CSV_WRITE_INTERVAL,
     WIFI_CSV_TIMEOUT_WARNING,
     SUBPROCESS_TIMEOUT_SHORT,
     SUBPROCESS_TIMEOUT_MEDIUM,
@@ -276,20 +277,26 @@ def parse_airodump_csv(csv_path):
     clients = {}
 
     try:
+        # Stream the file line by line; a blank line ends a section and the
+        # next non-blank line is the following section's header
+        section = None
         with open(csv_path, 'r', errors='replace') as f:
-            content = f.read()
-
-        sections = content.split('\n\n')
-
-        for section in sections:
-            lines = section.strip().split('\n')
-            if not lines:
-                continue
-
-            header = lines[0] if lines else ''
+            for line in f:
+                line = line.strip()
+                if not line:
+                    section = None
+                    continue
+
+                if section is None:
+                    if 'BSSID' in line and 'ESSID' in line:
+                        section = 'ap'
+                    elif 'Station MAC' in line:
+                        section = 'station'
+                    else:
+                        section = 'other'
+                    continue
 
-            if 'BSSID' in header and 'ESSID' in header:
-                for line in lines[1:]:
+                if section == 'ap':
                     parts = [p.strip() for p in line.split(',')]
                     if len(parts) >= 14:
                         bssid = parts[0]
@@ -310,8 +317,7 @@ def parse_airodump_csv(csv_path):
                                 'essid': parts[13] or 'Hidden'
                             }
 
-            elif 'Station MAC' in header:
-                for line in lines[1:]:
+                elif section == 'station':
                     parts = [p.strip() for p in line.split(',')]
                     if len(parts) >= 6:
                         station = parts[0]
@@ -682,6 +688,7 @@ async def start_wifi_scan():
             airodump_path,
             '-w', csv_path,
             '--output-format', 'csv,pcap',
+            '--write-interval', str(WIFI_CSV_WRITE_INTERVAL),
             '--band', band,
             interface
         ]
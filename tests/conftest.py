@@ -1,30 +1,104 @@
 """Pytest configuration and fixtures."""
 
+from functools import cache
+
 import pytest
+import utils.database as db_module
 from app import app as flask_app
 from routes import register_blueprints
+from utils.database import init_db
+from utils.dependencies import clear_tool_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tool_lookups():
+    """Drop cached tool paths so tests that patch shutil.which see their patch."""
+    clear_tool_cache()
 
 
 @pytest.fixture(scope='session')
-def app():
-    """Create application for testing."""
+def app(tmp_path_factory):
+    """Create application for testing, backed by a throwaway database."""
     flask_app.config['TESTING'] = True
+
+    # Point the database at a per-session (and per-xdist-worker) temp file
+    # instead of instance/valentine.db. A plain :memory: database would not
+    # survive get_connection() opening a fresh connection per call.
+    original_db_dir, original_db_path = db_module.DB_DIR, db_module.DB_PATH
+    test_db_dir = tmp_path_factory.mktemp('app_db')
+    db_module.DB_DIR = test_db_dir
+    db_module.DB_PATH = test_db_dir / 'test.db'
+    init_db()
+
     # Register blueprints only if not already registered
     if 'pager' not in flask_app.blueprints:
         register_blueprints(flask_app)
-    return flask_app
+
+    yield flask_app
+
+    db_module.DB_DIR, db_module.DB_PATH = original_db_dir, original_db_path
+
+
+# Test clients returned by finished tests, reused LIFO with their state cleared
+_client_pool = []
+
+
+def _acquire_client(app):
+    """Take a clean test client from the pool, or create one."""
+    return _client_pool.pop() if _client_pool else app.test_client()
+
+
+def _release_client(client):
+    """Clear a test client's cookies and push promises and return it to the pool."""
+    client.cookie_jar.clear()
+    client.push_promises.clear()
+    _client_pool.append(client)
 
 
 @pytest.fixture
 def client(app):
     """Create test client."""
-    return app.test_client()
+    client = _acquire_client(app)
+    yield client
+    _release_client(client)
+
+
+@pytest.fixture(scope='session')
+def auth_cookie(app):
+    """Signed session cookie with logged_in = True, built once per session."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    return serializer.dumps({'logged_in': True})
 
 
 @pytest.fixture
-async def auth_client(app):
+def auth_client(app, auth_cookie):
     """Create an authenticated test client with session['logged_in'] = True."""
-    client = app.test_client()
-    async with client.session_transaction() as sess:
-        sess['logged_in'] = True
-    return client
+    client = _acquire_client(app)
+    client.set_cookie('localhost', app.config['SESSION_COOKIE_NAME'], auth_cookie)
+    yield client
+    _release_client(client)
+
+
+@cache
+def _route_table(app) -> dict:
+    """Map static rule paths (no URL variables) to their view functions."""
+    return {
+        rule.rule: app.view_functions[rule.endpoint]
+        for rule in app.url_map.iter_rules()
+        if not rule.arguments
+    }
+
+
+@pytest.fixture(scope='session')
+def direct_view(app):
+    """Call the view for a static path directly inside a request context.
+
+    Skips URL matching, the before_request auth chain and the test client's
+    ASGI round-trip, so only use it where none of those are under test.
+    """
+    async def call(path: str, method: str = 'GET', **kwargs):
+        view = _route_table(app)[path]
+        async with app.test_request_context(path, method=method, **kwargs):
+            return await app.make_response(await view())
+
+    return call
@@ -13,7 +13,7 @@ import json
 import os
 import pytest
 import tempfile
-from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, MagicMock
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,7 +23,7 @@ from utils.agent_client import (
 )
 from utils.database import (
     init_db, get_db_path, create_agent, get_agent, get_agent_by_name,
-    list_agents, update_agent, delete_agent, store_push_payload,
+    list_agents, update_agent, delete_agent, store_push_payload, store_push_payloads,
     get_recent_payloads, cleanup_old_payloads
 )
 
@@ -150,8 +150,7 @@ class TestAgentClient:
         assert headers['X-API-Key'] == 'test-key'
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_get_capabilities(self, mock_client_cls):
+    async def test_get_capabilities(self):
         """get_capabilities should parse JSON response."""
         mock_response = Mock()
         mock_response.json.return_value = {
@@ -163,19 +162,15 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         caps = await client.get_capabilities()
 
         assert caps['modes']['adsb'] is True
         assert len(caps['devices']) == 1
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_get_status(self, mock_client_cls):
+    async def test_get_status(self):
         """get_status should return status dict."""
         mock_response = Mock()
         mock_response.json.return_value = {
@@ -187,19 +182,15 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         status = await client.get_status()
 
         assert 'adsb' in status['running_modes']
         assert status['uptime'] == 3600
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_health_check_healthy(self, mock_client_cls):
+    async def test_health_check_healthy(self):
         """health_check should return True for healthy agent."""
         mock_response = Mock()
         mock_response.json.return_value = {'status': 'healthy'}
@@ -207,30 +198,22 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         assert await client.health_check() is True
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_health_check_unhealthy(self, mock_client_cls):
+    async def test_health_check_unhealthy(self):
         """health_check should return False for connection error."""
         import httpx
         mock_client = AsyncMock()
         mock_client.get.side_effect = httpx.ConnectError("Connection refused")
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         assert await client.health_check() is False
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_start_mode(self, mock_client_cls):
+    async def test_start_mode(self):
         """start_mode should POST to correct endpoint."""
         mock_response = Mock()
         mock_response.json.return_value = {'status': 'started', 'mode': 'adsb'}
@@ -238,11 +221,8 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.post.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         result = await client.start_mode('adsb', {'device_index': 0})
 
         assert result['status'] == 'started'
@@ -251,8 +231,7 @@ class TestAgentClient:
         assert '/adsb/start' in call_url
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_stop_mode(self, mock_client_cls):
+    async def test_stop_mode(self):
         """stop_mode should POST to stop endpoint."""
         mock_response = Mock()
         mock_response.json.return_value = {'status': 'stopped'}
@@ -260,18 +239,14 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.post.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         result = await client.stop_mode('wifi')
 
         assert result['status'] == 'stopped'
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_get_mode_data(self, mock_client_cls):
+    async def test_get_mode_data(self):
         """get_mode_data should return data snapshot."""
         mock_response = Mock()
         mock_response.json.return_value = {
@@ -285,53 +260,41 @@ class TestAgentClient:
         mock_response.raise_for_status = Mock()
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
         result = await client.get_mode_data('adsb')
 
         assert len(result['data']) == 2
         assert result['data'][0]['icao'] == 'ABC123'
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_connection_error_handling(self, mock_client_cls):
+    async def test_connection_error_handling(self):
         """Client should raise AgentConnectionError on connection failure."""
         import httpx
         mock_client = AsyncMock()
         mock_client.get.side_effect = httpx.ConnectError("Connection refused")
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
 
         with pytest.raises(AgentConnectionError) as exc_info:
             await client.get_capabilities()
         assert 'Cannot connect' in str(exc_info.value)
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_timeout_error_handling(self, mock_client_cls):
+    async def test_timeout_error_handling(self):
         """Client should raise AgentConnectionError on timeout."""
         import httpx
         mock_client = AsyncMock()
         mock_client.get.side_effect = httpx.TimeoutException("Request timed out")
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020', timeout=5.0)
+        client = AgentClient('http://localhost:8020', timeout=5.0, http_client=mock_client)
 
         with pytest.raises(AgentConnectionError) as exc_info:
             await client.get_status()
         assert 'timed out' in str(exc_info.value)
 
     @pytest.mark.asyncio
-    @patch('utils.agent_client.httpx.AsyncClient')
-    async def test_http_error_handling(self, mock_client_cls):
+    async def test_http_error_handling(self):
         """Client should raise AgentHTTPError on HTTP errors."""
         import httpx
         mock_response = Mock()
@@ -342,16 +305,47 @@ class TestAgentClient:
         )
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        client = AgentClient('http://localhost:8020')
+        client = AgentClient('http://localhost:8020', http_client=mock_client)
 
         with pytest.raises(AgentHTTPError) as exc_info:
             await client.get_capabilities()
         assert exc_info.value.status_code == 500
 
+    @pytest.mark.asyncio
+    async def test_shared_http_client_reused(self):
+        """Agent clients without an injected client should share one pool."""
+        from utils.agent_client import close_http_client, get_http_client
+
+        try:
+            first = AgentClient('http://192.168.1.50:8020')._client()
+            second = AgentClient('http://192.168.1.51:8020')._client()
+            assert first is second
+            assert first is get_http_client()
+        finally:
+            await close_http_client()
+
+    def test_http_client_closed_on_loop_change(self):
+        """A new event loop should close the client left by the previous one."""
+        from utils.agent_client import close_http_client, get_http_client
+
+        async def open_client():
+            return get_http_client()
+
+        async def replace_client():
+            try:
+                client = get_http_client()
+                await asyncio.sleep(0)
+                return client
+            finally:
+                await close_http_client()
+
+        old = asyncio.run(open_client())
+        assert not old.is_closed
+        new = asyncio.run(replace_client())
+        assert new is not old
+        assert old.is_closed
+
     def test_create_client_from_agent(self):
         """create_client_from_agent should create configured client."""
         agent = {
@@ -550,6 +544,20 @@ class TestDatabasePayloads:
 
         assert payload_id > 0
 
+    def test_store_push_payloads_batch(self):
+        """store_push_payloads should insert a batch and return IDs in order."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+
+        payload_ids = store_push_payloads([
+            {'agent_id': agent_id, 'scan_type': 'adsb', 'payload': {'n': 0}},
+            {'agent_id': agent_id, 'scan_type': 'wifi', 'payload': {'n': 1}, 'interface': 'wlan0'},
+        ])
+
+        assert len(payload_ids) == 2
+        assert payload_ids[0] < payload_ids[1]
+        assert len(get_recent_payloads(agent_id=agent_id)) == 2
+        assert get_agent(agent_id)['last_seen'] is not None
+
     def test_get_recent_payloads(self):
         """get_recent_payloads should return stored payloads."""
         agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
@@ -566,6 +574,19 @@ class TestDatabasePayloads:
         adsb_payloads = get_recent_payloads(agent_id=agent_id, scan_type='adsb')
         assert len(adsb_payloads) == 2
 
+    def test_get_recent_payloads_since(self):
+        """get_recent_payloads should only return payloads at or after since."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+
+        store_push_payload(agent_id, 'adsb', {'n': 0}, received_at='2024-01-15T10:00:00Z')
+        store_push_payload(agent_id, 'adsb', {'n': 1}, received_at='2024-01-15T12:00:00+00:00')
+        store_push_payload(agent_id, 'adsb', {'n': 2}, received_at='2024-01-15 13:00:00')
+
+        payloads = get_recent_payloads(agent_id=agent_id, since='2024-01-15T11:00:00Z')
+
+        assert [p['payload']['n'] for p in payloads] == [2, 1]
+        assert payloads[1]['received_at'] == '2024-01-15 12:00:00'
+
     def test_get_recent_payloads_includes_agent_name(self):
         """Payloads should include agent name."""
         agent_id = create_agent(name='my-sensor', base_url='http://localhost:8020')
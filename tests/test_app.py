@@ -38,3 +38,29 @@ async def test_adsb_dashboard(auth_client):
     """Test ADS-B dashboard loads."""
     response = await auth_client.get('/adsb/dashboard')
     assert response.status_code == 200
+
+
+def test_api_token_cache_follows_secret_key(app):
+    """Rotating the secret key should produce a different API token."""
+    from app import _generate_api_token
+
+    original = app.secret_key
+    token = _generate_api_token('admin')
+    assert _generate_api_token('admin') == token
+    try:
+        app.secret_key = 'rotated-test-secret'
+        assert _generate_api_token('admin') != token
+    finally:
+        app.secret_key = original
+    assert _generate_api_token('admin') == token
+
+
+def test_api_token_matches_hmac_sha256(app):
+    """API tokens must stay HMAC-SHA256(secret, 'valentine-api-token:<user>') hex."""
+    import hashlib
+    import hmac
+    from app import _generate_api_token
+
+    secret = app.secret_key.encode() if isinstance(app.secret_key, str) else app.secret_key
+    expected = hmac.new(secret, b'valentine-api-token:admin', hashlib.sha256).hexdigest()
+    assert _generate_api_token('admin') == expected
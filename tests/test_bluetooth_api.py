@@ -85,16 +85,9 @@ class TestScanEndpoints:
     async def test_start_scan_success(self, client, mock_scanner):
         """Test starting a scan successfully."""
         mock_scanner.start_scan.return_value = True
-        mock_status = MagicMock()
-        mock_status.mode = "auto"
-        mock_status.backend = "dbus"
-        mock_status.adapter_id = None
-        mock_status.to_dict.return_value = {
-            'is_scanning': True,
-            'mode': 'auto',
-            'backend': 'dbus',
-        }
-        mock_scanner.get_status.return_value = mock_status
+        mock_scanner.get_status.return_value = ScanStatus(
+            is_scanning=True, mode='auto', backend='dbus',
+        )
 
         response = await client.post('/api/bluetooth/scan/start',
             json={'mode': 'auto', 'duration_s': 30})
@@ -108,13 +101,9 @@ class TestScanEndpoints:
     async def test_start_scan_already_scanning(self, client, mock_scanner):
         """Test starting scan when already scanning."""
         mock_scanner.is_scanning = True
-        mock_status = MagicMock()
-        mock_status.to_dict.return_value = {
-            'is_scanning': True,
-            'mode': 'auto',
-            'backend': 'dbus',
-        }
-        mock_scanner.get_status.return_value = mock_status
+        mock_scanner.get_status.return_value = ScanStatus(
+            is_scanning=True, mode='auto', backend='dbus',
+        )
 
         response = await client.post('/api/bluetooth/scan/start', json={})
 
@@ -126,9 +115,7 @@ class TestScanEndpoints:
     async def test_start_scan_failed(self, client, mock_scanner):
         """Test start scan failure."""
         mock_scanner.start_scan.return_value = False
-        mock_status = MagicMock()
-        mock_status.error = 'Failed to start scan'
-        mock_scanner.get_status.return_value = mock_status
+        mock_scanner.get_status.return_value = ScanStatus(error='Failed to start scan')
 
         response = await client.post('/api/bluetooth/scan/start', json={})
 
@@ -151,20 +138,9 @@ class TestScanEndpoints:
     @pytest.mark.asyncio
     async def test_get_scan_status(self, client, mock_scanner):
         """Test getting scan status."""
-        mock_status = MagicMock()
-        mock_status.to_dict.return_value = {
-            'is_scanning': True,
-            'mode': 'dbus',
-            'backend': 'dbus',
-            'adapter_id': None,
-            'started_at': None,
-            'duration_s': None,
-            'elapsed_seconds': None,
-            'remaining_seconds': None,
-            'devices_found': 10,
-            'error': None,
-        }
-        mock_scanner.get_status.return_value = mock_status
+        mock_scanner.get_status.return_value = ScanStatus(
+            is_scanning=True, mode='dbus', backend='dbus', devices_found=10,
+        )
 
         response = await client.get('/api/bluetooth/scan/status')
 
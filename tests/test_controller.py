@@ -13,7 +13,7 @@ import json
 import os
 import pytest
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -22,6 +22,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Fixtures
 # =============================================================================
 
+# Push-auth header matching sample_agent's api_key; the test client copies it
+_AGENT_HEADERS = {'X-API-Key': 'test-key'}
+
+
 @pytest.fixture
 def setup_db(tmp_path):
     """Set up a temporary database."""
@@ -59,6 +63,14 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def mock_agent_client(monkeypatch):
+    """Replace create_client_from_agent with a factory returning one AsyncMock client."""
+    mock_client = AsyncMock()
+    monkeypatch.setattr('routes.controller.create_client_from_agent', lambda *_: mock_client)
+    return mock_client
+
+
 @pytest.fixture
 def sample_agent(setup_db):
     """Create a sample agent in database."""
@@ -95,7 +107,7 @@ class TestAgentCRUD:
         """POST /controller/agents should register new agent."""
         with patch('routes.controller.AgentClient') as MockClient:
             # Mock successful capability fetch
-            mock_instance = Mock()
+            mock_instance = AsyncMock()
             mock_instance.get_capabilities.return_value = {
                 'modes': {'adsb': True, 'wifi': True},
                 'devices': [{'name': 'RTL-SDR'}]
@@ -202,80 +214,68 @@ class TestAgentCRUD:
 class TestProxyOperations:
     """Tests for proxying operations to agents."""
 
-    async def test_proxy_start_mode(self, client, sample_agent):
+    async def test_proxy_start_mode(self, client, sample_agent, mock_agent_client):
         """POST /controller/agents/<id>/<mode>/start should proxy to agent."""
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.start_mode.return_value = {'status': 'started', 'mode': 'adsb'}
-            mock_create.return_value = mock_client
-
-            response = await client.post(
-                f'/controller/agents/{sample_agent}/adsb/start',
-                json={'device_index': 0}
-            )
+        mock_agent_client.start_mode.return_value = {'status': 'started', 'mode': 'adsb'}
 
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'success'
-            assert data['mode'] == 'adsb'
+        response = await client.post(
+            f'/controller/agents/{sample_agent}/adsb/start',
+            json={'device_index': 0}
+        )
 
-            mock_client.start_mode.assert_called_once_with('adsb', {'device_index': 0})
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'success'
+        assert data['mode'] == 'adsb'
+
+        mock_agent_client.start_mode.assert_awaited_once_with('adsb', {'device_index': 0})
 
-    async def test_proxy_stop_mode(self, client, sample_agent):
+    async def test_proxy_stop_mode(self, client, sample_agent, mock_agent_client):
         """POST /controller/agents/<id>/<mode>/stop should proxy to agent."""
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.stop_mode.return_value = {'status': 'stopped'}
-            mock_create.return_value = mock_client
+        mock_agent_client.stop_mode.return_value = {'status': 'stopped'}
 
-            response = await client.post(
-                f'/controller/agents/{sample_agent}/wifi/stop'
-            )
+        response = await client.post(
+            f'/controller/agents/{sample_agent}/wifi/stop'
+        )
 
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'success'
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'success'
 
-    async def test_proxy_get_mode_data(self, client, sample_agent):
+    async def test_proxy_get_mode_data(self, client, sample_agent, mock_agent_client):
         """GET /controller/agents/<id>/<mode>/data should return data."""
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.get_mode_data.return_value = {
-                'mode': 'adsb',
-                'data': [{'icao': 'ABC123'}]
-            }
-            mock_create.return_value = mock_client
+        mock_agent_client.get_mode_data.return_value = {
+            'mode': 'adsb',
+            'data': [{'icao': 'ABC123'}]
+        }
 
-            response = await client.get(f'/controller/agents/{sample_agent}/adsb/data')
+        response = await client.get(f'/controller/agents/{sample_agent}/adsb/data')
 
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'success'
-            assert 'agent_name' in data
-            assert data['agent_name'] == 'test-sensor'
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'success'
+        assert 'agent_name' in data
+        assert data['agent_name'] == 'test-sensor'
 
     async def test_proxy_agent_not_found(self, client):
         """Proxy operations should return 404 for missing agent."""
         response = await client.post('/controller/agents/99999/adsb/start')
         assert response.status_code == 404
 
-    async def test_proxy_connection_error(self, client, sample_agent):
+    async def test_proxy_connection_error(self, client, sample_agent, mock_agent_client):
         """Proxy should return 503 when agent unreachable."""
         from utils.agent_client import AgentConnectionError
 
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.start_mode.side_effect = AgentConnectionError("Connection refused")
-            mock_create.return_value = mock_client
+        mock_agent_client.start_mode.side_effect = AgentConnectionError("Connection refused")
 
-            response = await client.post(
-                f'/controller/agents/{sample_agent}/adsb/start',
-                json={}
-            )
+        response = await client.post(
+            f'/controller/agents/{sample_agent}/adsb/start',
+            json={}
+        )
 
-            assert response.status_code == 503
-            data = await response.get_json()
-            assert 'Cannot connect' in data['message']
+        assert response.status_code == 503
+        data = await response.get_json()
+        assert 'Cannot connect' in data['message']
 
 
 # =============================================================================
@@ -298,7 +298,7 @@ class TestPushIngestion:
 
         response = await client.post('/controller/api/ingest',
             json=payload,
-            headers={'X-API-Key': 'test-key'}
+            headers=_AGENT_HEADERS
         )
 
         assert response.status_code == 202
@@ -306,6 +306,58 @@ class TestPushIngestion:
         assert data['status'] == 'accepted'
         assert 'payload_id' in data
 
+    async def test_ingest_by_agent_id(self, client, sample_agent):
+        """POST /controller/api/ingest should accept a cached agent_id."""
+        response = await client.post('/controller/api/ingest',
+            json={'agent_id': sample_agent, 'scan_type': 'wifi', 'payload': {}},
+            headers=_AGENT_HEADERS
+        )
+
+        assert response.status_code == 202
+        data = await response.get_json()
+        assert data['agent_id'] == sample_agent
+
+    async def test_ingest_agent_id_name_mismatch(self, client, sample_agent):
+        """POST /controller/api/ingest should reject an agent_id that does not match agent_name."""
+        response = await client.post('/controller/api/ingest',
+            json={'agent_id': sample_agent, 'agent_name': 'other-sensor', 'payload': {}},
+            headers=_AGENT_HEADERS
+        )
+
+        assert response.status_code == 401
+
+    async def test_ingest_raw_encoded_body(self, client, sample_agent):
+        """POST /controller/api/ingest should decode a pre-encoded body without a JSON content type."""
+        from utils import json_codec
+
+        body = json_codec.dumps_bytes({
+            'agent_id': sample_agent, 'scan_type': 'sensor', 'payload': {'id': 1},
+        })
+        response = await client.post('/controller/api/ingest',
+            data=body,
+            headers=_AGENT_HEADERS
+        )
+
+        assert response.status_code == 202
+
+    async def test_ingest_numeric_received_at(self, client, sample_agent):
+        """POST /controller/api/ingest should accept a non-string received_at."""
+        response = await client.post('/controller/api/ingest',
+            json={'agent_id': sample_agent, 'scan_type': 'adsb', 'payload': {}, 'received_at': 1705314600},
+            headers=_AGENT_HEADERS
+        )
+
+        assert response.status_code == 202
+
+    async def test_ingest_malformed_body(self, client):
+        """POST /controller/api/ingest should reject a body that is not JSON."""
+        response = await client.post('/controller/api/ingest',
+            data=b'{not json',
+            headers=_AGENT_HEADERS
+        )
+
+        assert response.status_code == 400
+
     async def test_ingest_unknown_agent(self, client):
         """POST /controller/api/ingest should reject unknown agent."""
         payload = {
@@ -349,6 +401,70 @@ class TestPushIngestion:
         data = await response.get_json()
         assert 'agent_name required' in data['message']
 
+    async def test_ingest_concurrent_batched(self, client, sample_agent):
+        """Concurrent ingests should be coalesced and each get a distinct payload_id."""
+        import asyncio
+
+        responses = await asyncio.gather(*[
+            client.post('/controller/api/ingest',
+                json={
+                    'agent_name': 'test-sensor',
+                    'scan_type': 'adsb',
+                    'payload': {'aircraft': [{'icao': f'BATCH{i}'}]}
+                },
+                headers=_AGENT_HEADERS
+            )
+            for i in range(5)
+        ])
+
+        assert all(r.status_code == 202 for r in responses)
+        payload_ids = {(await r.get_json())['payload_id'] for r in responses}
+        assert len(payload_ids) == 5
+
+    async def test_ingest_batch_failure_isolated(self, monkeypatch):
+        """A record that fails to store should not fail the rest of its batch."""
+        import asyncio
+        from routes.controller import IngestBatcher
+
+        def store(records):
+            if any(r.get('bad') for r in records):
+                raise ValueError('bad record')
+            return [r['n'] for r in records]
+
+        monkeypatch.setattr('routes.controller.store_push_payloads', store)
+        batcher = IngestBatcher(max_batch=3, flush_interval=60)
+
+        results = await asyncio.gather(
+            batcher.submit({'n': 1}), batcher.submit({'n': 2, 'bad': True}), batcher.submit({'n': 3}),
+            return_exceptions=True,
+        )
+
+        assert results[0] == 1 and results[2] == 3
+        assert isinstance(results[1], ValueError)
+
+    def test_ingest_batcher_resets_on_new_loop(self, monkeypatch):
+        """Records left pending by a closed event loop should not leak into the next one."""
+        import asyncio
+        from routes.controller import IngestBatcher
+
+        written = []
+
+        def store(records):
+            written.append([r['n'] for r in records])
+            return [r['n'] for r in records]
+
+        monkeypatch.setattr('routes.controller.store_push_payloads', store)
+        batcher = IngestBatcher(max_batch=10, flush_interval=60)
+
+        async def abandon():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(batcher.submit({'n': 1}), 0.01)
+
+        asyncio.run(abandon())
+        batcher.flush_interval = 0
+        assert asyncio.run(batcher.submit({'n': 2})) == 2
+        assert written == [[2]]
+
     async def test_get_payloads(self, client, sample_agent):
         """GET /controller/api/payloads should return stored payloads."""
         # First ingest some data
@@ -359,7 +475,7 @@ class TestPushIngestion:
                     'scan_type': 'adsb',
                     'payload': {'aircraft': [{'icao': f'TEST{i}'}]}
                 },
-                headers={'X-API-Key': 'test-key'}
+                headers=_AGENT_HEADERS
             )
 
         response = await client.get(f'/controller/api/payloads?agent_id={sample_agent}')
@@ -373,11 +489,11 @@ class TestPushIngestion:
         # Ingest mixed data
         await client.post('/controller/api/ingest',
             json={'agent_name': 'test-sensor', 'scan_type': 'adsb', 'payload': {}},
-            headers={'X-API-Key': 'test-key'}
+            headers=_AGENT_HEADERS
         )
         await client.post('/controller/api/ingest',
             json={'agent_name': 'test-sensor', 'scan_type': 'wifi', 'payload': {}},
-            headers={'X-API-Key': 'test-key'}
+            headers=_AGENT_HEADERS
         )
 
         response = await client.get('/controller/api/payloads?scan_type=adsb')
@@ -385,6 +501,33 @@ class TestPushIngestion:
 
         assert all(p['scan_type'] == 'adsb' for p in data['payloads'])
 
+    async def test_get_payloads_invalid_since(self, client):
+        """GET /controller/api/payloads should reject an unparseable since."""
+        response = await client.get('/controller/api/payloads?since=yesterday')
+        assert response.status_code == 400
+
+    async def test_get_payloads_conditional_get(self, client, sample_agent):
+        """GET /controller/api/payloads should return 304 until new data arrives."""
+        ingest = {
+            'json': {'agent_name': 'test-sensor', 'scan_type': 'adsb', 'payload': {}},
+            'headers': _AGENT_HEADERS,
+        }
+        await client.post('/controller/api/ingest', **ingest)
+
+        url = f'/controller/api/payloads?agent_id={sample_agent}'
+        response = await client.get(url)
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+
+        response = await client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+        await client.post('/controller/api/ingest', **ingest)
+        response = await client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['count'] == 2
+
 
 # =============================================================================
 # Location Estimation Tests
@@ -410,6 +553,25 @@ class TestLocationEstimation:
         assert data['status'] == 'success'
         assert data['device_id'] == 'AA:BB:CC:DD:EE:FF'
 
+    async def test_add_observation_upserts_per_agent(self, client):
+        """Repeated observations from one agent should replace, not accumulate."""
+        from routes.controller import device_tracker
+
+        for rssi in (-60, -58, -55):
+            await client.post('/controller/api/location/observe',
+                json={
+                    'device_id': '11:22:33:44:55:66',
+                    'agent_name': 'sensor-1',
+                    'agent_lat': 40.7128,
+                    'agent_lon': -74.0060,
+                    'rssi': rssi
+                }
+            )
+
+        agent_obs = device_tracker.observations['11:22:33:44:55:66']
+        assert list(agent_obs) == ['sensor-1']
+        assert agent_obs['sensor-1'].rssi == -55
+
     async def test_add_observation_missing_fields(self, client):
         """POST /controller/api/location/observe should require all fields."""
         response = await client.post('/controller/api/location/observe',
@@ -494,38 +656,54 @@ class TestLocationEstimation:
 class TestAgentRefresh:
     """Tests for agent refresh operations."""
 
-    async def test_refresh_agent_success(self, client, sample_agent):
+    async def test_refresh_agent_success(self, client, sample_agent, mock_agent_client):
         """POST /controller/agents/<id>/refresh should update metadata."""
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.refresh_metadata.return_value = {
-                'healthy': True,
-                'capabilities': {
-                    'modes': {'adsb': True, 'wifi': True, 'bluetooth': True},
-                    'devices': [{'name': 'RTL-SDR V3'}]
-                },
-                'status': {'running_modes': ['adsb']},
-                'config': {}
-            }
-            mock_create.return_value = mock_client
+        mock_agent_client.refresh_metadata.return_value = {
+            'healthy': True,
+            'capabilities': {
+                'modes': {'adsb': True, 'wifi': True, 'bluetooth': True},
+                'devices': [{'name': 'RTL-SDR V3'}]
+            },
+            'status': {'running_modes': ['adsb']},
+            'config': {}
+        }
 
-            response = await client.post(f'/controller/agents/{sample_agent}/refresh')
+        response = await client.post(f'/controller/agents/{sample_agent}/refresh')
 
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'success'
-            assert data['metadata']['healthy'] is True
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'success'
+        assert data['metadata']['healthy'] is True
+        mock_agent_client.refresh_metadata.assert_awaited_once()
 
-    async def test_refresh_agent_unreachable(self, client, sample_agent):
+    async def test_refresh_agent_unreachable(self, client, sample_agent, mock_agent_client):
         """POST /controller/agents/<id>/refresh should return 503 if unreachable."""
-        with patch('routes.controller.create_client_from_agent') as mock_create:
-            mock_client = Mock()
-            mock_client.refresh_metadata.return_value = {'healthy': False}
-            mock_create.return_value = mock_client
+        mock_agent_client.refresh_metadata.return_value = {'healthy': False}
+
+        response = await client.post(f'/controller/agents/{sample_agent}/refresh')
+
+        assert response.status_code == 503
 
-            response = await client.post(f'/controller/agents/{sample_agent}/refresh')
 
-            assert response.status_code == 503
+class TestAgentHealth:
+    """Tests for multi-agent health checks."""
+
+    async def test_check_all_agents_health(self, client, sample_agent, mock_agent_client):
+        """GET /controller/agents/health should check every agent concurrently."""
+        from utils.database import create_agent
+        create_agent(name='second-sensor', base_url='http://192.168.1.51:8020')
+
+        mock_agent_client.health_check.return_value = True
+        mock_agent_client.get_status.return_value = {'running_modes': ['adsb']}
+
+        response = await client.get('/controller/agents/health')
+
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['total'] == 2
+        assert data['healthy_count'] == 2
+        assert all(a['running_modes'] == ['adsb'] for a in data['agents'])
+        assert mock_agent_client.health_check.await_count == 2
 
 
 # =============================================================================
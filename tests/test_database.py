@@ -254,3 +254,69 @@ class TestDeviceCorrelations:
                    if c['wifi_mac'] == 'AA:AA:AA:AA:AA:AA']
         assert len(matching) == 1
         assert matching[0]['confidence'] == 0.9
+
+
+class TestPayloadVersions:
+    """Tests for the push payload change counters behind controller ETags."""
+
+    def test_store_bumps_agent_and_any_agent_versions(self, temp_db):
+        """Test a stored payload changes its agent's version and the global one only."""
+        from utils.database import create_agent, store_push_payload, get_payload_version
+
+        sensor = create_agent('sensor-a', 'http://a.local')
+        other = create_agent('sensor-b', 'http://b.local')
+        before = (get_payload_version(sensor), get_payload_version(other), get_payload_version())
+
+        store_push_payload(sensor, 'wifi', {})
+
+        assert get_payload_version(sensor) > before[0]
+        assert get_payload_version(other) == before[1]
+        assert get_payload_version() > before[2]
+
+    def test_cleanup_bumps_every_version(self, temp_db):
+        """Test removing old payloads changes the version of every agent."""
+        from utils.database import (
+            create_agent, store_push_payload, cleanup_old_payloads, get_payload_version
+        )
+
+        sensor = create_agent('sensor-a', 'http://a.local')
+        other = create_agent('sensor-b', 'http://b.local')
+        store_push_payload(sensor, 'wifi', {}, received_at='2000-01-01T00:00:00')
+        before = get_payload_version(other)
+
+        assert cleanup_old_payloads(max_age_hours=1) == 1
+        assert get_payload_version(other) > before
+
+
+class TestPayloadTimestamps:
+    """Tests for received_at normalization on push payloads."""
+
+    def test_unparseable_received_at_uses_current_time(self, temp_db):
+        """Test an unparseable received_at is not stored raw."""
+        from utils.database import create_agent, store_push_payload, get_recent_payloads
+
+        sensor = create_agent('sensor-a', 'http://a.local')
+        store_push_payload(sensor, 'wifi', {}, received_at='not a time')
+
+        received_at = get_recent_payloads(agent_id=sensor)[0]['received_at']
+        assert received_at != 'not a time'
+        assert len(received_at) == 19 and received_at[10] == ' '
+
+    def test_init_db_normalizes_legacy_received_at(self, temp_db):
+        """Test init_db rewrites ISO and unparseable values stored by older versions."""
+        from utils.database import create_agent, get_db, init_db, get_recent_payloads
+
+        sensor = create_agent('sensor-a', 'http://a.local')
+        with get_db() as conn:
+            conn.executemany(
+                'INSERT INTO push_payloads (agent_id, scan_type, payload, received_at) VALUES (?, ?, ?, ?)',
+                [(sensor, 'wifi', '{}', '2024-01-15T10:30:00Z'), (sensor, 'wifi', '{}', 'garbage')],
+            )
+
+        init_db()
+
+        stamps = {p['received_at'] for p in get_recent_payloads(agent_id=sensor)}
+        assert '2024-01-15 10:30:00' in stamps
+        assert 'garbage' not in stamps
+        # The rewritten ISO row now falls outside a later since filter
+        assert len(get_recent_payloads(agent_id=sensor, since='2024-01-15T11:00:00Z')) == 1
@@ -1,7 +1,6 @@
 """Tests for the DMR / Digital Voice decoding module."""
 
 from unittest.mock import patch, MagicMock
-import pytest
 from routes.dmr import parse_dsd_output, _DSD_PROTOCOL_FLAGS, _DSD_FME_PROTOCOL_FLAGS, _DSD_FME_MODULATION
 
 
@@ -164,14 +163,6 @@ def test_dsd_fme_modulation_hints():
 # Endpoint tests
 # ============================================
 
-@pytest.fixture
-async def auth_client(client):
-    """Client with logged-in session."""
-    async with client.session_transaction() as sess:
-        sess['logged_in'] = True
-    return client
-
-
 async def test_dmr_tools(auth_client):
     """Tools endpoint should return availability info."""
     resp = await auth_client.get('/dmr/tools')
@@ -1,4 +1,5 @@
 import pytest
+from functools import lru_cache
 from pathlib import Path
 import importlib.metadata
 try:
@@ -10,10 +11,12 @@ import re
 def get_root_path():
     return Path(__file__).parent.parent
 
+@lru_cache(maxsize=1024)
 def _clean_string(req):
     """Normalizes a requirement string (lowercase and removes spaces)."""
     return req.strip().lower().replace(" ", "")
 
+@lru_cache(maxsize=1024)
 def _extract_package_name(req):
     """Extract just the package name from a requirement string, without version."""
     cleaned = _clean_string(req)
@@ -18,46 +18,20 @@ class TestRtlFmDemodMode:
         """WFM (wideband FM) must become 'wbfm' for rtl_fm."""
         assert _rtl_fm_demod_mode('wfm') == 'wbfm'
 
-    def test_fm_passes_through(self):
-        """Narrowband FM passes through unchanged."""
-        assert _rtl_fm_demod_mode('fm') == 'fm'
-
-    def test_am_passes_through(self):
-        """AM passes through unchanged."""
-        assert _rtl_fm_demod_mode('am') == 'am'
-
-    def test_usb_passes_through(self):
-        """Upper sideband passes through unchanged."""
-        assert _rtl_fm_demod_mode('usb') == 'usb'
-
-    def test_lsb_passes_through(self):
-        """Lower sideband passes through unchanged."""
-        assert _rtl_fm_demod_mode('lsb') == 'lsb'
-
-    def test_all_valid_modulations_have_translation(self):
-        """Every valid modulation must produce a non-empty rtl_fm -M value."""
-        for mod in VALID_MODULATIONS:
-            result = _rtl_fm_demod_mode(mod)
-            assert result, f"Empty translation for modulation '{mod}'"
-            assert isinstance(result, str)
-
-    def test_wfm_is_only_translated_modulation(self):
-        """Only 'wfm' should be translated; all others pass through."""
-        for mod in VALID_MODULATIONS:
-            result = _rtl_fm_demod_mode(mod)
-            if mod == 'wfm':
-                assert result != mod, "wfm must be translated to wbfm"
-            else:
-                assert result == mod, f"'{mod}' should pass through unchanged, got '{result}'"
+    @pytest.mark.parametrize('mod', sorted(VALID_MODULATIONS))
+    def test_valid_modulation_translation(self, mod):
+        """Only 'wfm' is translated (to 'wbfm'); every other modulation passes through."""
+        expected = 'wbfm' if mod == 'wfm' else mod
+        assert _rtl_fm_demod_mode(mod) == expected
 
 
 class TestNormalizeModulation:
     """Test normalize_modulation() validation."""
 
-    def test_valid_modulations(self):
+    @pytest.mark.parametrize('mod', sorted(VALID_MODULATIONS))
+    def test_valid_modulations(self, mod):
         """All valid modulations should normalize successfully."""
-        for mod in VALID_MODULATIONS:
-            assert normalize_modulation(mod) == mod
+        assert normalize_modulation(mod) == mod
 
     def test_case_insensitive(self):
         """Modulation names should be case-insensitive."""
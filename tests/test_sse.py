@@ -0,0 +1,58 @@
+"""Tests for the SSE fan-out utilities."""
+
+import contextlib
+import queue
+import threading
+import time
+
+from utils.sse import _QueueFanoutChannel, _run_fanout
+
+_STOP = object()
+
+
+class _Stopped(Exception):
+    """Raised out of the source queue to end a test distributor thread."""
+
+
+class _StoppableQueue(queue.Queue):
+    """Source queue that ends the distributor thread once it reads _STOP."""
+
+    def get(self, *args, **kwargs):
+        item = super().get(*args, **kwargs)
+        if item is _STOP:
+            raise _Stopped
+        return item
+
+
+def _distribute(channel):
+    """Run the distributor loop until the source queue yields _STOP."""
+    with contextlib.suppress(_Stopped):
+        _run_fanout(channel)
+
+
+def test_slow_subscriber_stays_bounded():
+    """A subscriber that never reads keeps only the newest frames, up to its maxsize."""
+    # A private channel kept out of the fan-out registry, so nothing outlives the test
+    source = _StoppableQueue()
+    subscriber = queue.Queue(maxsize=4)
+    channel = _QueueFanoutChannel(source_queue=source, source_timeout=0.05, subscribers={subscriber})
+    distributor = threading.Thread(target=_distribute, args=(channel,), daemon=True)
+    distributor.start()
+    try:
+        for frame in range(20):
+            source.put(frame)
+
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            with subscriber.mutex:
+                if subscriber.queue and subscriber.queue[-1] == 19:
+                    break
+            time.sleep(0.01)
+
+        with subscriber.mutex:
+            assert list(subscriber.queue) == [16, 17, 18, 19]
+    finally:
+        source.put(_STOP)
+        distributor.join(timeout=2.0)
+
+    assert not distributor.is_alive()
@@ -1,7 +1,9 @@
 """Tests for the UAT (978 MHz) ADS-B decoding module."""
 
+import os
+import shutil
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
-import json
 import pytest
 
 from routes.uat import (
@@ -15,49 +17,47 @@ from routes.uat import (
 # _parse_uat_aircraft() tests
 # ============================================
 
+# Read-only so a parser that starts mutating its input fails loudly
+MINIMAL_MSG = MappingProxyType({
+    'address': 'A12345',
+    'callsign': 'N12345',
+})
+
+FULL_MSG = MappingProxyType({
+    'address': 'ABCDEF',
+    'callsign': '  UAL123  ',
+    'altitude': {'baro': 5500},
+    'position': {'lat': 40.7128, 'lon': -74.0060},
+    'velocity': {
+        'groundspeed': 120,
+        'heading': 270,
+        'vertical_rate': -500,
+    },
+    'squawk': 1200,
+})
+
 
 def test_parse_basic_aircraft():
     """Should parse a minimal UAT aircraft message with ICAO address."""
-    data = {
-        'address': 'A12345',
-        'callsign': 'N12345',
-    }
-    result = _parse_uat_aircraft(data)
+    result = _parse_uat_aircraft(MINIMAL_MSG)
     assert result is not None
     assert result['icao'] == 'A12345'
     assert result['callsign'] == 'N12345'
     assert result['source'] == 'uat'
 
 
-def test_parse_missing_address():
-    """Should return None when ICAO address is missing."""
-    data = {'callsign': 'N12345'}
-    result = _parse_uat_aircraft(data)
-    assert result is None
-
-
-def test_parse_empty_address():
-    """Should return None when ICAO address is empty string."""
-    data = {'address': '', 'callsign': 'N12345'}
-    result = _parse_uat_aircraft(data)
-    assert result is None
+@pytest.mark.parametrize('data', [
+    {'callsign': 'N12345'},
+    {'address': '', 'callsign': 'N12345'},
+], ids=['missing', 'empty'])
+def test_parse_no_address(data):
+    """Should return None when ICAO address is missing or empty."""
+    assert _parse_uat_aircraft(data) is None
 
 
 def test_parse_full_aircraft():
     """Should parse a complete UAT aircraft message with all fields."""
-    data = {
-        'address': 'ABCDEF',
-        'callsign': '  UAL123  ',
-        'altitude': {'baro': 5500},
-        'position': {'lat': 40.7128, 'lon': -74.0060},
-        'velocity': {
-            'groundspeed': 120,
-            'heading': 270,
-            'vertical_rate': -500,
-        },
-        'squawk': 1200,
-    }
-    result = _parse_uat_aircraft(data)
+    result = _parse_uat_aircraft(FULL_MSG)
     assert result is not None
     assert result['icao'] == 'ABCDEF'
     assert result['callsign'] == 'UAL123'
@@ -113,32 +113,35 @@ def test_parse_squawk_as_string():
 # ============================================
 
 
-@patch('shutil.which')
-def test_find_dump978_in_path(mock_which):
+@pytest.fixture
+def no_tools(monkeypatch):
+    """Make every binary lookup (PATH, file exists, executable) come up empty."""
+    monkeypatch.setattr(shutil, 'which', lambda name: None)
+    monkeypatch.setattr(os.path, 'isfile', lambda path: False)
+    monkeypatch.setattr(os, 'access', lambda path, mode: False)
+
+
+def test_find_dump978_in_path(monkeypatch):
     """Should find dump978-fa via shutil.which."""
-    mock_which.side_effect = lambda name: '/usr/bin/dump978-fa' if name == 'dump978-fa' else None
+    monkeypatch.setattr(
+        shutil, 'which',
+        lambda name: '/usr/bin/dump978-fa' if name == 'dump978-fa' else None,
+    )
     assert find_dump978() == '/usr/bin/dump978-fa'
 
 
-@patch('shutil.which', return_value=None)
-@patch('os.path.isfile', return_value=False)
-@patch('os.access', return_value=False)
-def test_find_dump978_not_installed(mock_access, mock_isfile, mock_which):
+def test_find_dump978_not_installed(no_tools):
     """Should return None when dump978 is not installed."""
     assert find_dump978() is None
 
 
-@patch('shutil.which')
-def test_find_uat2json_in_path(mock_which):
+def test_find_uat2json_in_path(monkeypatch):
     """Should find uat2json via shutil.which."""
-    mock_which.return_value = '/usr/bin/uat2json'
+    monkeypatch.setattr(shutil, 'which', lambda name: '/usr/bin/uat2json')
     assert find_uat2json() == '/usr/bin/uat2json'
 
 
-@patch('shutil.which', return_value=None)
-@patch('os.path.isfile', return_value=False)
-@patch('os.access', return_value=False)
-def test_find_uat2json_not_installed(mock_access, mock_isfile, mock_which):
+def test_find_uat2json_not_installed(no_tools):
     """Should return None when uat2json is not installed."""
     assert find_uat2json() is None
 
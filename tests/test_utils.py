@@ -4,44 +4,52 @@ import pytest
 from utils.process import is_valid_mac, is_valid_channel
 from utils.dependencies import check_tool
 from data.oui import get_manufacturer
+from utils import json_codec, quart_json
 
 
 class TestMacValidation:
     """Tests for MAC address validation."""
 
-    def test_valid_mac(self):
-        """Test valid MAC addresses."""
-        assert is_valid_mac('AA:BB:CC:DD:EE:FF') is True
-        assert is_valid_mac('aa:bb:cc:dd:ee:ff') is True
-        assert is_valid_mac('00:11:22:33:44:55') is True
-
-    def test_invalid_mac(self):
-        """Test invalid MAC addresses."""
-        assert is_valid_mac('') is False
-        assert is_valid_mac(None) is False
-        assert is_valid_mac('invalid') is False
-        assert is_valid_mac('AA:BB:CC:DD:EE') is False
-        assert is_valid_mac('AA-BB-CC-DD-EE-FF') is False
+    @pytest.mark.parametrize('mac,expected', [
+        ('AA:BB:CC:DD:EE:FF', True),
+        ('aa:bb:cc:dd:ee:ff', True),
+        ('00:11:22:33:44:55', True),
+        ('', False),
+        (None, False),
+        ('invalid', False),
+        ('AA:BB:CC:DD:EE', False),
+        ('AA-BB-CC-DD-EE-FF', False),
+        ('AA:BB:CC:DD:EE:FF\n', False),
+        ('AA:BB:CC:DD:EE:FG', False),
+        (':A:BB:CC:DD:EE:FF', False),
+    ])
+    def test_is_valid_mac(self, mac, expected):
+        """Test valid and invalid MAC addresses."""
+        assert is_valid_mac(mac) is expected
 
 
 class TestChannelValidation:
     """Tests for WiFi channel validation."""
 
-    def test_valid_channels(self):
-        """Test valid channel numbers."""
-        assert is_valid_channel(1) is True
-        assert is_valid_channel(6) is True
-        assert is_valid_channel(11) is True
-        assert is_valid_channel('36') is True
-        assert is_valid_channel(149) is True
-
-    def test_invalid_channels(self):
-        """Test invalid channel numbers."""
-        assert is_valid_channel(0) is False
-        assert is_valid_channel(-1) is False
-        assert is_valid_channel(201) is False
-        assert is_valid_channel(None) is False
-        assert is_valid_channel('invalid') is False
+    @pytest.mark.parametrize('channel,expected', [
+        (1, True),
+        (6, True),
+        (11, True),
+        ('36', True),
+        (' 6 ', True),
+        ('+6', True),
+        (149, True),
+        (0, False),
+        (-1, False),
+        (201, False),
+        (None, False),
+        ('invalid', False),
+        ('-6', False),
+        ('6a', False),
+    ])
+    def test_is_valid_channel(self, channel, expected):
+        """Test valid and invalid channel numbers."""
+        assert is_valid_channel(channel) is expected
 
 
 class TestToolCheck:
@@ -57,6 +65,20 @@ class TestToolCheck:
         """Test that nonexistent tools return False."""
         assert check_tool('nonexistent_tool_xyz_12345') is False
 
+    def test_lookup_cached_until_cleared(self):
+        """Test repeated checks reuse the cached lookup until the cache is cleared."""
+        from unittest.mock import patch
+        from utils.dependencies import clear_tool_cache
+
+        with patch('shutil.which', return_value='/usr/bin/rtl_test') as mock_which:
+            assert check_tool('rtl_test') is True
+            assert check_tool('rtl_test') is True
+            assert mock_which.call_count == 1
+
+            clear_tool_cache()
+            assert check_tool('rtl_test') is True
+            assert mock_which.call_count == 2
+
 
 class TestOuiLookup:
     """Tests for OUI manufacturer lookup."""
@@ -71,3 +93,91 @@ class TestOuiLookup:
         """Test looking up unknown manufacturer."""
         result = get_manufacturer('FF:FF:FF:FF:FF:FF')
         assert result == 'Unknown'
+
+    def test_longer_prefix_wins(self):
+        """Test MA-M style prefixes take precedence over the MA-L prefix."""
+        from unittest.mock import patch
+        from data import oui
+
+        entries = {'70:B3:D5': 'IEEE Registration Authority', '70:B3:D5:0': 'Small Vendor'}
+        try:
+            with patch.dict(oui.OUI_DATABASE, entries, clear=True):
+                oui.reindex_oui_database()
+                assert get_manufacturer('70:b3:d5:01:23:45') == 'Small Vendor'
+                assert get_manufacturer('70:B3:D5:91:23:45') == 'IEEE Registration Authority'
+        finally:
+            # Rebuild from the restored table even if an assertion failed
+            oui.reindex_oui_database()
+
+    def test_reindex_clears_cached_lookups(self):
+        """Test cached results do not survive a reload of the database."""
+        from unittest.mock import patch
+        from data import oui
+
+        get_manufacturer('00:25:DB:AA:BB:CC')
+        try:
+            with patch.dict(oui.OUI_DATABASE, {'00:25:DB': 'Reloaded Vendor'}, clear=True):
+                oui.reindex_oui_database()
+                assert get_manufacturer('00:25:DB:AA:BB:CC') == 'Reloaded Vendor'
+        finally:
+            oui.reindex_oui_database()
+
+
+class TestJsonCodec:
+    """Tests for the fast JSON codec helpers."""
+
+    def test_round_trip(self):
+        """Test encoding and decoding preserve data."""
+        data = {'aircraft': [{'icao': 'ABC123', 'altitude': 35000}], 'ok': True, 'n': None}
+        assert json_codec.loads(json_codec.dumps(data)) == data
+        assert json_codec.loads(json_codec.dumps_bytes(data)) == data
+
+    def test_non_string_keys(self):
+        """Test integer keys are encoded as strings like the stdlib."""
+        assert json_codec.loads(json_codec.dumps({1: 'a'})) == {'1': 'a'}
+
+    def test_invalid_json_raises_value_error(self):
+        """Test invalid documents raise ValueError."""
+        with pytest.raises(ValueError):
+            json_codec.loads(b'{not json')
+
+
+class TestOrjsonProvider:
+    """Tests that the orjson-backed Quart provider matches the default one."""
+
+    @pytest.fixture
+    def providers(self):
+        from quart import Quart
+        from quart.json.provider import DefaultJSONProvider
+
+        app = Quart(__name__)
+        return quart_json.OrjsonProvider(app), DefaultJSONProvider(app)
+
+    def test_matches_default_provider(self, providers):
+        """Test output decodes identically, including dates, dataclasses and int keys."""
+        from dataclasses import dataclass
+        from datetime import datetime, timezone
+
+        @dataclass
+        class Point:
+            lat: float
+            lon: float
+
+        fast, default = providers
+        data = {
+            'z': 1, 'a': [1.5, None, True], 'when': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            'where': Point(51.5, -0.1), 'channels': {6: 'wifi'},
+        }
+        assert json_codec.loads(fast.dumps(data)) == json_codec.loads(default.dumps(data))
+        assert list(json_codec.loads(fast.dumps({'b': 1, 'a': 2}))) == ['a', 'b']
+
+    def test_big_int_falls_back(self, providers):
+        """Test integers orjson cannot encode fall back to the stdlib."""
+        fast, _ = providers
+        assert fast.dumps({'n': 2 ** 70}) == f'{{"n": {2 ** 70}}}'
+
+    def test_loads(self, providers):
+        """Test decoding str and bytes."""
+        fast, _ = providers
+        assert fast.loads('{"a": 1}') == {'a': 1}
+        assert fast.loads(b'[1, 2]') == [1, 2]
@@ -1,80 +1,81 @@
 """Tests for the Waterfall / Spectrogram endpoints."""
 
-from unittest.mock import patch, MagicMock
 import pytest
 
+# Request bodies are serialized once rather than through json= on every post
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_FM_BAND = b'{"start_freq": 88.0, "end_freq": 108.0}'
+_FM_BAND_REVERSED = b'{"start_freq": 108.0, "end_freq": 88.0}'
+_FM_BAND_DEVICE_0 = b'{"start_freq": 88.0, "end_freq": 108.0, "gain": 40, "device": 0}'
+
+
+class _FreeSdrApp:
+    """Stand-in for the app module whose SDR device claim always succeeds."""
+
+    claim_sdr_device = staticmethod(lambda device, mode: None)
+
+
+class _BusySdrApp(_FreeSdrApp):
+    """Stand-in for the app module whose SDR device is already claimed."""
+
+    claim_sdr_device = staticmethod(lambda device, mode: 'SDR device 0 is in use by scanner')
+
 
 @pytest.fixture
-async def auth_client(client):
-    """Client with logged-in session."""
-    async with client.session_transaction() as sess:
-        sess['logged_in'] = True
-    return client
+def rtl_power_available(monkeypatch):
+    """Report rtl_power as installed."""
+    monkeypatch.setattr('routes.listening_post.find_rtl_power', lambda: '/usr/bin/rtl_power')
 
 
-async def test_waterfall_start_no_rtl_power(auth_client):
+@pytest.fixture
+def rtl_power_missing(monkeypatch):
+    """Report rtl_power as not installed."""
+    monkeypatch.setattr('routes.listening_post.find_rtl_power', lambda: None)
+
+
+async def test_waterfall_start_no_rtl_power(auth_client, rtl_power_missing):
     """Start should fail gracefully when rtl_power is not available."""
-    with patch('routes.listening_post.find_rtl_power', return_value=None):
-        resp = await auth_client.post('/listening/waterfall/start', json={
-            'start_freq': 88.0,
-            'end_freq': 108.0,
-        })
-        assert resp.status_code == 503
-        data = await resp.get_json()
-        assert 'rtl_power' in data['message']
+    resp = await auth_client.post('/listening/waterfall/start', data=_FM_BAND, headers=_JSON_HEADERS)
+    assert resp.status_code == 503
+    data = await resp.get_json()
+    assert 'rtl_power' in data['message']
 
 
-async def test_waterfall_start_invalid_range(auth_client):
+async def test_waterfall_start_invalid_range(auth_client, rtl_power_available):
     """Start should reject end <= start."""
-    with patch('routes.listening_post.find_rtl_power', return_value='/usr/bin/rtl_power'):
-        resp = await auth_client.post('/listening/waterfall/start', json={
-            'start_freq': 108.0,
-            'end_freq': 88.0,
-        })
-        assert resp.status_code == 400
+    resp = await auth_client.post('/listening/waterfall/start', data=_FM_BAND_REVERSED, headers=_JSON_HEADERS)
+    assert resp.status_code == 400
 
 
-async def test_waterfall_start_success(auth_client):
+async def test_waterfall_start_success(auth_client, rtl_power_available, monkeypatch):
     """Start should succeed with mocked rtl_power and device."""
-    with patch('routes.listening_post.find_rtl_power', return_value='/usr/bin/rtl_power'), \
-         patch('routes.listening_post.app_module') as mock_app:
-        mock_app.claim_sdr_device.return_value = None  # No error, claim succeeds
-        resp = await auth_client.post('/listening/waterfall/start', json={
-            'start_freq': 88.0,
-            'end_freq': 108.0,
-            'gain': 40,
-            'device': 0,
-        })
-        assert resp.status_code == 200
-        data = await resp.get_json()
-        assert data['status'] == 'started'
+    monkeypatch.setattr('routes.listening_post.app_module', _FreeSdrApp)
+    resp = await auth_client.post('/listening/waterfall/start', data=_FM_BAND_DEVICE_0, headers=_JSON_HEADERS)
+    assert resp.status_code == 200
+    data = await resp.get_json()
+    assert data['status'] == 'started'
 
     # Clean up: stop waterfall
     import routes.listening_post as lp
     lp.waterfall_running = False
 
 
-async def test_waterfall_stop(auth_client):
+async def test_waterfall_stop(direct_view):
     """Stop should succeed."""
-    resp = await auth_client.post('/listening/waterfall/stop')
+    resp = await direct_view('/listening/waterfall/stop', method='POST')
     assert resp.status_code == 200
     data = await resp.get_json()
     assert data['status'] == 'stopped'
 
 
-async def test_waterfall_stream_mimetype(auth_client):
+async def test_waterfall_stream_mimetype(direct_view):
     """Stream should return event-stream content type."""
-    resp = await auth_client.get('/listening/waterfall/stream')
+    resp = await direct_view('/listening/waterfall/stream')
     assert resp.content_type.startswith('text/event-stream')
 
 
-async def test_waterfall_start_device_busy(auth_client):
+async def test_waterfall_start_device_busy(auth_client, rtl_power_available, monkeypatch):
     """Start should fail when device is in use."""
-    with patch('routes.listening_post.find_rtl_power', return_value='/usr/bin/rtl_power'), \
-         patch('routes.listening_post.app_module') as mock_app:
-        mock_app.claim_sdr_device.return_value = 'SDR device 0 is in use by scanner'
-        resp = await auth_client.post('/listening/waterfall/start', json={
-            'start_freq': 88.0,
-            'end_freq': 108.0,
-        })
-        assert resp.status_code == 409
+    monkeypatch.setattr('routes.listening_post.app_module', _BusySdrApp)
+    resp = await auth_client.post('/listening/waterfall/start', data=_FM_BAND, headers=_JSON_HEADERS)
+    assert resp.status_code == 409
@@ -6,41 +6,114 @@ Covers all weather_sat endpoints: /status, /satellites, /start, /test-decode,
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from unittest.mock import patch, MagicMock, AsyncMock, mock_open
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 import pytest
 
 from quart import Response
-from utils.weather_sat import WeatherSatImage, WEATHER_SATELLITES
+from utils.weather_sat import WeatherSatImage
 from datetime import datetime, timezone
 
+# Every test here is a coroutine with sync fixtures; share one event loop
+pytestmark = pytest.mark.asyncio(loop_scope='session')
+
+# Shared image fixtures; the route only reads them, so one set serves every test
+_FIXED_TS = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+_SAMPLE_IMAGES = tuple(
+    WeatherSatImage(
+        filename=f'test{i}.png',
+        path=Path(f'/tmp/test{i}.png'),
+        satellite='NOAA-18',
+        mode='APT',
+        timestamp=_FIXED_TS,
+        frequency=137.9125,
+    )
+    for i in range(10)
+)
+_NOAA_19_IMAGE = WeatherSatImage(
+    filename='NOAA-19_test.png',
+    path=Path('/tmp/noaa19.png'),
+    satellite='NOAA-19',
+    mode='APT',
+    timestamp=_FIXED_TS,
+    frequency=137.100,
+)
+
+# Canonical predict_passes() entry; read-only so tests copy it before use
+_SAMPLE_PASS = MappingProxyType({
+    'id': 'NOAA-18_202401011200',
+    'satellite': 'NOAA-18',
+    'name': 'NOAA 18',
+    'frequency': 137.9125,
+    'mode': 'APT',
+    'startTime': '2024-01-01 12:00 UTC',
+    'startTimeISO': '2024-01-01T12:00:00+00:00',
+    'endTimeISO': '2024-01-01T12:15:00+00:00',
+    'maxEl': 45.0,
+    'maxElAz': 180.0,
+    'riseAz': 160.0,
+    'setAz': 200.0,
+    'duration': 15.0,
+    'quality': 'good',
+})
+
+
+def _make_decoder() -> SimpleNamespace:
+    """Idle decoder stub; only the methods routes call are Mocks."""
+    return SimpleNamespace(
+        is_running=False,
+        current_satellite='',
+        current_frequency=0.0,
+        device_index=0,
+        _output_dir=Path('/tmp'),
+        get_status=Mock(return_value={}),
+        start=Mock(return_value=True),
+        start_from_file=Mock(return_value=True),
+        stop=Mock(),
+        get_images=Mock(return_value=[]),
+        delete_image=Mock(return_value=True),
+        delete_all_images=Mock(return_value=0),
+        set_callback=Mock(),
+        set_on_complete=Mock(),
+    )
+
 
 class TestWeatherSatRoutes:
     """Tests for weather satellite routes."""
 
-    async def test_get_status(self, auth_client):
-        """GET /weather-sat/status returns decoder status."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.get_status.return_value = {
-                'available': True,
-                'decoder': 'satdump',
-                'running': False,
-                'satellite': '',
-                'frequency': 0.0,
-                'mode': '',
-                'elapsed_seconds': 0,
-                'image_count': 0,
-            }
-            mock_get.return_value = mock_decoder
+    @pytest.fixture(autouse=True)
+    def satdump_available(self):
+        """Report SatDump as installed; tests can flip return_value."""
+        with patch('routes.weather_sat.is_weather_sat_available', return_value=True) as mock_available:
+            yield mock_available
 
-            response = await auth_client.get('/weather-sat/status')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['available'] is True
-            assert data['decoder'] == 'satdump'
-            assert data['running'] is False
+    @pytest.fixture(autouse=True)
+    def decoder(self):
+        """Patch the decoder factory to return an idle decoder stub."""
+        decoder = _make_decoder()
+        with patch('routes.weather_sat.get_weather_sat_decoder', return_value=decoder):
+            yield decoder
+
+    async def test_get_status(self, auth_client, decoder):
+        """GET /weather-sat/status returns decoder status."""
+        decoder.get_status.return_value = {
+            'available': True,
+            'decoder': 'satdump',
+            'running': False,
+            'satellite': '',
+            'frequency': 0.0,
+            'mode': '',
+            'elapsed_seconds': 0,
+            'image_count': 0,
+        }
+
+        response = await auth_client.get('/weather-sat/status')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['available'] is True
+        assert data['decoder'] == 'satdump'
+        assert data['running'] is False
 
     async def test_list_satellites(self, auth_client):
         """GET /weather-sat/satellites returns satellite list."""
@@ -66,148 +139,89 @@ class TestWeatherSatRoutes:
         assert noaa_18['frequency'] == 137.9125
         assert noaa_18['mode'] == 'APT'
 
-    async def test_start_capture_success(self, auth_client):
+    async def test_start_capture_success(self, auth_client, decoder):
         """POST /weather-sat/start successfully starts capture."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('routes.weather_sat.queue.Queue') as mock_queue:
+        decoder.start.return_value = True
 
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_decoder.start.return_value = True
-            mock_get.return_value = mock_decoder
+        payload = {
+            'satellite': 'NOAA-18',
+            'device': 0,
+            'gain': 40.0,
+            'bias_t': False,
+        }
 
-            payload = {
-                'satellite': 'NOAA-18',
-                'device': 0,
-                'gain': 40.0,
-                'bias_t': False,
-            }
-
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
+        response = await auth_client.post(
+            '/weather-sat/start',
+            json=payload,
+        )
 
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'started'
-            assert data['satellite'] == 'NOAA-18'
-            assert data['frequency'] == 137.9125
-            assert data['mode'] == 'APT'
-            assert data['device'] == 0
-
-            mock_decoder.start.assert_called_once_with(
-                satellite='NOAA-18',
-                device_index=0,
-                gain=40.0,
-                bias_t=False,
-            )
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'started'
+        assert data['satellite'] == 'NOAA-18'
+        assert data['frequency'] == 137.9125
+        assert data['mode'] == 'APT'
+        assert data['device'] == 0
+
+        decoder.start.assert_called_once_with(
+            satellite='NOAA-18',
+            device_index=0,
+            gain=40.0,
+            bias_t=False,
+        )
 
-    async def test_start_capture_no_satdump(self, auth_client):
+    async def test_start_capture_no_satdump(self, auth_client, satdump_available):
         """POST /weather-sat/start returns error when SatDump unavailable."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=False):
-            payload = {'satellite': 'NOAA-18'}
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
-
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'SatDump not installed' in data['message']
-
-    async def test_start_capture_already_running(self, auth_client):
-        """POST /weather-sat/start when already running."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = True
-            mock_decoder.current_satellite = 'NOAA-19'
-            mock_decoder.current_frequency = 137.100
-            mock_get.return_value = mock_decoder
-
-            payload = {'satellite': 'NOAA-18'}
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
-
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'already_running'
-            assert data['satellite'] == 'NOAA-19'
-
-    async def test_start_capture_invalid_satellite(self, auth_client):
-        """POST /weather-sat/start with invalid satellite."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
-
-            payload = {'satellite': 'FAKE-SAT-99'}
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
-
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'Invalid satellite' in data['message']
+        satdump_available.return_value = False
 
-    async def test_start_capture_invalid_device(self, auth_client):
-        """POST /weather-sat/start with invalid device index."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
-
-            payload = {'satellite': 'NOAA-18', 'device': -1}
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
+        payload = {'satellite': 'NOAA-18'}
+        response = await auth_client.post(
+            '/weather-sat/start',
+            json=payload,
+        )
 
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
+        assert response.status_code == 400
+        data = await response.get_json()
+        assert data['status'] == 'error'
+        assert 'SatDump not installed' in data['message']
 
-    async def test_start_capture_invalid_gain(self, auth_client):
-        """POST /weather-sat/start with invalid gain."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
+    async def test_start_capture_already_running(self, auth_client, decoder):
+        """POST /weather-sat/start when already running."""
+        decoder.is_running = True
+        decoder.current_satellite = 'NOAA-19'
+        decoder.current_frequency = 137.100
 
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
+        payload = {'satellite': 'NOAA-18'}
+        response = await auth_client.post(
+            '/weather-sat/start',
+            json=payload,
+        )
 
-            payload = {'satellite': 'NOAA-18', 'gain': 999}
-            response = await auth_client.post(
-                '/weather-sat/start',
-                json=payload,
-            )
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'already_running'
+        assert data['satellite'] == 'NOAA-19'
+
+    @pytest.mark.parametrize('payload,message', [
+        ({'satellite': 'FAKE-SAT-99'}, 'Invalid satellite'),
+        ({'satellite': 'NOAA-18', 'device': -1}, 'Invalid parameter value'),
+        ({'satellite': 'NOAA-18', 'gain': 999}, 'Invalid parameter value'),
+    ], ids=['invalid_satellite', 'invalid_device', 'invalid_gain'])
+    async def test_start_capture_rejects(self, auth_client, payload, message):
+        """POST /weather-sat/start with an invalid satellite, device index or gain."""
+        response = await auth_client.post(
+            '/weather-sat/start',
+            json=payload,
+        )
 
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
+        assert response.status_code == 400
+        data = await response.get_json()
+        assert data['status'] == 'error'
+        assert message in data['message']
 
     async def test_start_capture_device_busy(self, auth_client):
         """POST /weather-sat/start when SDR device is busy."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('app.claim_sdr_device', return_value='Device busy with pager') as mock_claim:
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
-
+        with patch('app.claim_sdr_device', return_value='Device busy with pager'):
             payload = {'satellite': 'NOAA-18'}
             response = await auth_client.post(
                 '/weather-sat/start',
@@ -220,17 +234,11 @@ class TestWeatherSatRoutes:
             assert data['error_type'] == 'DEVICE_BUSY'
             assert 'Device busy' in data['message']
 
-    async def test_start_capture_start_failure(self, auth_client):
+    async def test_start_capture_start_failure(self, auth_client, decoder):
         """POST /weather-sat/start when decoder.start() fails."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('app.claim_sdr_device', return_value=None):
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_decoder.start.return_value = False
-            mock_get.return_value = mock_decoder
+        decoder.start.return_value = False
 
+        with patch('app.claim_sdr_device', return_value=None):
             payload = {'satellite': 'NOAA-18'}
             response = await auth_client.post(
                 '/weather-sat/start',
@@ -242,330 +250,189 @@ class TestWeatherSatRoutes:
             assert data['status'] == 'error'
             assert 'Failed to start capture' in data['message']
 
-    async def test_test_decode_success(self, auth_client):
+    async def test_test_decode_success(self, auth_client, decoder, monkeypatch):
         """POST /weather-sat/test-decode successfully starts file decode."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('pathlib.Path.is_file', return_value=True), \
-             patch('pathlib.Path.resolve') as mock_resolve:
+        decoder.start_from_file.return_value = True
 
-            # Mock path resolution to be under data/
-            mock_path = MagicMock()
-            mock_path.is_relative_to.return_value = True
-            mock_resolve.return_value = mock_path
+        # Resolve every path to somewhere under data/
+        resolved_path = MagicMock()
+        resolved_path.is_relative_to.return_value = True
+        monkeypatch.setattr(Path, 'is_file', lambda self: True)
+        monkeypatch.setattr(Path, 'resolve', lambda self, strict=False: resolved_path)
 
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_decoder.start_from_file.return_value = True
-            mock_get.return_value = mock_decoder
+        payload = {
+            'satellite': 'NOAA-18',
+            'input_file': 'data/weather_sat/test.wav',
+            'sample_rate': 1000000,
+        }
 
-            payload = {
-                'satellite': 'NOAA-18',
-                'input_file': 'data/weather_sat/test.wav',
-                'sample_rate': 1000000,
-            }
-
-            response = await auth_client.post(
-                '/weather-sat/test-decode',
-                json=payload,
-            )
-
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'started'
-            assert data['satellite'] == 'NOAA-18'
-            assert data['source'] == 'file'
-
-    async def test_test_decode_invalid_path(self, auth_client):
-        """POST /weather-sat/test-decode with path outside data/."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('pathlib.Path.resolve') as mock_resolve:
-
-            # Mock path outside allowed directory
-            mock_path = MagicMock()
-            mock_path.is_relative_to.return_value = False
-            mock_resolve.return_value = mock_path
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
-
-            payload = {
-                'satellite': 'NOAA-18',
-                'input_file': '/etc/passwd',
-            }
-
-            response = await auth_client.post(
-                '/weather-sat/test-decode',
-                json=payload,
-            )
-
-            assert response.status_code == 403
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'data/ directory' in data['message']
-
-    async def test_test_decode_file_not_found(self, auth_client):
-        """POST /weather-sat/test-decode with non-existent file."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('pathlib.Path.is_file', return_value=False), \
-             patch('pathlib.Path.resolve') as mock_resolve:
-
-            mock_path = MagicMock()
-            mock_path.is_relative_to.return_value = True
-            mock_resolve.return_value = mock_path
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
-
-            payload = {
-                'satellite': 'NOAA-18',
-                'input_file': 'data/missing.wav',
-            }
-
-            response = await auth_client.post(
-                '/weather-sat/test-decode',
-                json=payload,
-            )
-
-            assert response.status_code == 404
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'not found' in data['message'].lower()
-
-    async def test_test_decode_invalid_sample_rate(self, auth_client):
-        """POST /weather-sat/test-decode with invalid sample rate."""
-        with patch('routes.weather_sat.is_weather_sat_available', return_value=True), \
-             patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('pathlib.Path.is_file', return_value=True), \
-             patch('pathlib.Path.resolve') as mock_resolve:
-
-            # Mock path resolution to be under data/
-            mock_path = MagicMock()
-            mock_path.is_relative_to.return_value = True
-            mock_resolve.return_value = mock_path
-
-            mock_decoder = MagicMock()
-            mock_decoder.is_running = False
-            mock_get.return_value = mock_decoder
+        response = await auth_client.post(
+            '/weather-sat/test-decode',
+            json=payload,
+        )
 
-            payload = {
-                'satellite': 'NOAA-18',
-                'input_file': 'data/test.wav',
-                'sample_rate': 100,  # Too low
-            }
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'started'
+        assert data['satellite'] == 'NOAA-18'
+        assert data['source'] == 'file'
+
+    @pytest.mark.parametrize('payload,is_file,in_data_dir,status_code,message', [
+        ({'satellite': 'NOAA-18', 'input_file': '/etc/passwd'},
+         True, False, 403, 'data/ directory'),
+        ({'satellite': 'NOAA-18', 'input_file': 'data/missing.wav'},
+         False, True, 404, 'not found'),
+        ({'satellite': 'NOAA-18', 'input_file': 'data/test.wav', 'sample_rate': 100},
+         True, True, 400, 'sample_rate'),
+    ], ids=['outside_data_dir', 'file_not_found', 'invalid_sample_rate'])
+    async def test_test_decode_rejects(
+        self, auth_client, monkeypatch, payload, is_file, in_data_dir, status_code, message,
+    ):
+        """POST /weather-sat/test-decode with a bad path, missing file or bad sample rate."""
+        resolved_path = MagicMock()
+        resolved_path.is_relative_to.return_value = in_data_dir
+        monkeypatch.setattr(Path, 'is_file', lambda self: is_file)
+        monkeypatch.setattr(Path, 'resolve', lambda self, strict=False: resolved_path)
 
-            response = await auth_client.post(
-                '/weather-sat/test-decode',
-                json=payload,
-            )
+        response = await auth_client.post(
+            '/weather-sat/test-decode',
+            json=payload,
+        )
 
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'sample_rate' in data['message']
+        assert response.status_code == status_code
+        data = await response.get_json()
+        assert data['status'] == 'error'
+        assert message in data['message'].lower()
 
-    async def test_stop_capture(self, auth_client):
+    async def test_stop_capture(self, auth_client, decoder):
         """POST /weather-sat/stop stops capture."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.device_index = 0
-            mock_get.return_value = mock_decoder
-
-            response = await auth_client.post('/weather-sat/stop')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'stopped'
-            mock_decoder.stop.assert_called_once()
+        response = await auth_client.post('/weather-sat/stop')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'stopped'
+        decoder.stop.assert_called_once()
 
-    async def test_list_images_empty(self, auth_client):
+    async def test_list_images_empty(self, auth_client, decoder):
         """GET /weather-sat/images with no images."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.get_images.return_value = []
-            mock_get.return_value = mock_decoder
+        decoder.get_images.return_value = []
 
-            response = await auth_client.get('/weather-sat/images')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'ok'
-            assert data['images'] == []
-            assert data['count'] == 0
+        response = await auth_client.get('/weather-sat/images')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'ok'
+        assert data['images'] == []
+        assert data['count'] == 0
 
-    async def test_list_images_with_data(self, auth_client):
+    async def test_list_images_with_data(self, auth_client, decoder):
         """GET /weather-sat/images with images."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            image = WeatherSatImage(
-                filename='NOAA-18_test.png',
-                path=Path('/tmp/test.png'),
-                satellite='NOAA-18',
-                mode='APT',
-                timestamp=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
-                frequency=137.9125,
-                size_bytes=12345,
-                product='RGB Composite',
-            )
-            mock_decoder.get_images.return_value = [image]
-            mock_get.return_value = mock_decoder
+        image = WeatherSatImage(
+            filename='NOAA-18_test.png',
+            path=Path('/tmp/test.png'),
+            satellite='NOAA-18',
+            mode='APT',
+            timestamp=_FIXED_TS,
+            frequency=137.9125,
+            size_bytes=12345,
+            product='RGB Composite',
+        )
+        decoder.get_images.return_value = [image]
 
-            response = await auth_client.get('/weather-sat/images')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'ok'
-            assert data['count'] == 1
-            assert data['images'][0]['filename'] == 'NOAA-18_test.png'
-            assert data['images'][0]['satellite'] == 'NOAA-18'
+        response = await auth_client.get('/weather-sat/images')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'ok'
+        assert data['count'] == 1
+        assert data['images'][0]['filename'] == 'NOAA-18_test.png'
+        assert data['images'][0]['satellite'] == 'NOAA-18'
 
-    async def test_list_images_with_filter(self, auth_client):
+    async def test_list_images_with_filter(self, auth_client, decoder):
         """GET /weather-sat/images with satellite filter."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            image1 = WeatherSatImage(
-                filename='NOAA-18_test.png',
-                path=Path('/tmp/test1.png'),
-                satellite='NOAA-18',
-                mode='APT',
-                timestamp=datetime.now(timezone.utc),
-                frequency=137.9125,
-            )
-            image2 = WeatherSatImage(
-                filename='NOAA-19_test.png',
-                path=Path('/tmp/test2.png'),
-                satellite='NOAA-19',
-                mode='APT',
-                timestamp=datetime.now(timezone.utc),
-                frequency=137.100,
-            )
-            mock_decoder.get_images.return_value = [image1, image2]
-            mock_get.return_value = mock_decoder
+        decoder.get_images.return_value = [_SAMPLE_IMAGES[0], _NOAA_19_IMAGE]
 
-            response = await auth_client.get('/weather-sat/images?satellite=NOAA-18')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['count'] == 1
-            assert data['images'][0]['satellite'] == 'NOAA-18'
+        response = await auth_client.get('/weather-sat/images?satellite=NOAA-18')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['count'] == 1
+        assert data['images'][0]['satellite'] == 'NOAA-18'
 
-    async def test_list_images_with_limit(self, auth_client):
+    async def test_list_images_with_limit(self, auth_client, decoder):
         """GET /weather-sat/images with limit."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            images = [
-                WeatherSatImage(
-                    filename=f'test{i}.png',
-                    path=Path(f'/tmp/test{i}.png'),
-                    satellite='NOAA-18',
-                    mode='APT',
-                    timestamp=datetime.now(timezone.utc),
-                    frequency=137.9125,
-                )
-                for i in range(10)
-            ]
-            mock_decoder.get_images.return_value = images
-            mock_get.return_value = mock_decoder
+        decoder.get_images.return_value = list(_SAMPLE_IMAGES)
 
-            response = await auth_client.get('/weather-sat/images?limit=5')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['count'] == 5
+        response = await auth_client.get('/weather-sat/images?limit=5')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['count'] == 5
 
-    async def test_get_image_success(self, auth_client):
-        """GET /weather-sat/images/<filename> serves image."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('routes.weather_sat.send_file', new_callable=AsyncMock) as mock_send, \
+    @pytest.fixture
+    def image_file(self):
+        """Patch path resolution and send_file; the resolved image exists by default."""
+        with patch('routes.weather_sat.send_file', new_callable=AsyncMock) as mock_send, \
              patch('utils.safe_path.resolve_safe') as mock_resolve:
-
-            mock_decoder = MagicMock()
-            mock_decoder._output_dir = Path('/tmp')
-            mock_get.return_value = mock_decoder
-
-            mock_resolved_path = MagicMock()
-            mock_resolved_path.exists.return_value = True
-            mock_resolve.return_value = mock_resolved_path
-
+            resolved_path = MagicMock()
+            resolved_path.exists.return_value = True
+            mock_resolve.return_value = resolved_path
             mock_send.return_value = Response(b'fake image data', mimetype='image/png')
+            yield SimpleNamespace(path=resolved_path, send_file=mock_send)
 
-            response = await auth_client.get('/weather-sat/images/test_image.png')
-            assert response.status_code == 200
-            mock_send.assert_called_once()
-            call_args = mock_send.call_args
-            assert call_args[1]['mimetype'] == 'image/png'
+    async def test_get_image_success(self, auth_client, image_file):
+        """GET /weather-sat/images/<filename> serves image."""
+        response = await auth_client.get('/weather-sat/images/test_image.png')
+        assert response.status_code == 200
+        image_file.send_file.assert_called_once()
+        assert image_file.send_file.call_args[1]['mimetype'] == 'image/png'
 
     async def test_get_image_invalid_filename(self, auth_client):
         """GET /weather-sat/images/<filename> with invalid filename."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_get.return_value = mock_decoder
-
-            # Use a filename with special characters that fails the isalnum check
-            # (after replacing _, -, .) but won't be treated as path traversal by the framework
-            response = await auth_client.get('/weather-sat/images/test%20image!.png')
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert data['status'] == 'error'
-            assert 'Invalid filename' in data['message']
+        # Use a filename with special characters that fails the isalnum check
+        # (after replacing _, -, .) but won't be treated as path traversal by the framework
+        response = await auth_client.get('/weather-sat/images/test%20image!.png')
+        assert response.status_code == 400
+        data = await response.get_json()
+        assert data['status'] == 'error'
+        assert 'Invalid filename' in data['message']
 
     async def test_get_image_wrong_extension(self, auth_client):
         """GET /weather-sat/images/<filename> with wrong extension."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_get.return_value = mock_decoder
-
-            response = await auth_client.get('/weather-sat/images/test.txt')
-            assert response.status_code == 400
-            data = await response.get_json()
-            assert 'PNG/JPG' in data['message']
+        response = await auth_client.get('/weather-sat/images/test.txt')
+        assert response.status_code == 400
+        data = await response.get_json()
+        assert 'PNG/JPG' in data['message']
 
-    async def test_get_image_not_found(self, auth_client):
+    async def test_get_image_not_found(self, auth_client, image_file):
         """GET /weather-sat/images/<filename> for non-existent image."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get, \
-             patch('pathlib.Path.exists', return_value=False):
-
-            mock_decoder = MagicMock()
-            mock_decoder._output_dir = Path('/tmp')
-            mock_get.return_value = mock_decoder
+        image_file.path.exists.return_value = False
 
-            response = await auth_client.get('/weather-sat/images/missing.png')
-            assert response.status_code == 404
+        response = await auth_client.get('/weather-sat/images/missing.png')
+        assert response.status_code == 404
+        image_file.send_file.assert_not_called()
 
-    async def test_delete_image_success(self, auth_client):
+    async def test_delete_image_success(self, auth_client, decoder):
         """DELETE /weather-sat/images/<filename> deletes image."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.delete_image.return_value = True
-            mock_get.return_value = mock_decoder
+        decoder.delete_image.return_value = True
 
-            response = await auth_client.delete('/weather-sat/images/test.png')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'deleted'
-            assert data['filename'] == 'test.png'
+        response = await auth_client.delete('/weather-sat/images/test.png')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'deleted'
+        assert data['filename'] == 'test.png'
 
-    async def test_delete_image_not_found(self, auth_client):
+    async def test_delete_image_not_found(self, auth_client, decoder):
         """DELETE /weather-sat/images/<filename> for non-existent image."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.delete_image.return_value = False
-            mock_get.return_value = mock_decoder
+        decoder.delete_image.return_value = False
 
-            response = await auth_client.delete('/weather-sat/images/missing.png')
-            assert response.status_code == 404
+        response = await auth_client.delete('/weather-sat/images/missing.png')
+        assert response.status_code == 404
 
-    async def test_delete_all_images(self, auth_client):
+    async def test_delete_all_images(self, auth_client, decoder):
         """DELETE /weather-sat/images deletes all images."""
-        with patch('routes.weather_sat.get_weather_sat_decoder') as mock_get:
-            mock_decoder = MagicMock()
-            mock_decoder.delete_all_images.return_value = 5
-            mock_get.return_value = mock_decoder
+        decoder.delete_all_images.return_value = 5
 
-            response = await auth_client.delete('/weather-sat/images')
-            assert response.status_code == 200
-            data = await response.get_json()
-            assert data['status'] == 'ok'
-            assert data['deleted'] == 5
+        response = await auth_client.delete('/weather-sat/images')
+        assert response.status_code == 200
+        data = await response.get_json()
+        assert data['status'] == 'ok'
+        assert data['deleted'] == 5
 
     async def test_stream_progress(self, auth_client):
         """GET /weather-sat/stream returns SSE stream."""
@@ -592,24 +459,7 @@ class TestWeatherSatRoutes:
     async def test_get_passes_success(self, auth_client):
         """GET /weather-sat/passes successfully predicts passes."""
         with patch('utils.weather_sat_predict.predict_passes') as mock_predict:
-            mock_predict.return_value = [
-                {
-                    'id': 'NOAA-18_202401011200',
-                    'satellite': 'NOAA-18',
-                    'name': 'NOAA 18',
-                    'frequency': 137.9125,
-                    'mode': 'APT',
-                    'startTime': '2024-01-01 12:00 UTC',
-                    'startTimeISO': '2024-01-01T12:00:00+00:00',
-                    'endTimeISO': '2024-01-01T12:15:00+00:00',
-                    'maxEl': 45.0,
-                    'maxElAz': 180.0,
-                    'riseAz': 160.0,
-                    'setAz': 200.0,
-                    'duration': 15.0,
-                    'quality': 'good',
-                }
-            ]
+            mock_predict.return_value = [dict(_SAMPLE_PASS)]
 
             response = await auth_client.get('/weather-sat/passes?latitude=51.5&longitude=-0.1')
             assert response.status_code == 200
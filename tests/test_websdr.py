@@ -51,14 +51,6 @@ def test_haversine_known_distance():
 # Endpoint tests
 # ============================================
 
-@pytest.fixture
-async def auth_client(client):
-    """Client with logged-in session."""
-    async with client.session_transaction() as sess:
-        sess['logged_in'] = True
-    return client
-
-
 async def test_websdr_status(auth_client):
     """Status endpoint should return cache info."""
     resp = await auth_client.get('/websdr/status')
@@ -18,14 +18,16 @@ def mock_app_module():
         mock.wifi_clients = {}
         yield mock
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
+    """Bare app with only the WiFi blueprint, built once per session."""
     app = Quart(__name__)
     app.register_blueprint(wifi_bp)
     return app
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app):
+    """Shared client; WiFi state lives on the per-test mock_app_module."""
     return app.test_client()
 
 def test_parse_airodump_csv():
@@ -38,10 +40,14 @@ def test_parse_airodump_csv():
         "11:22:33:44:55:66, 2023-01-01, 2023-01-01, -60, 20, AA:BB:CC:DD:EE:FF, MyWiFi\n"
     )
 
-    with patch("builtins.open", mock_open(read_data=csv_content)), \
+    mocked_open = mock_open(read_data=csv_content)
+    with patch("builtins.open", mocked_open), \
          patch("routes.wifi.get_manufacturer", return_value="Apple"):
         networks, clients = parse_airodump_csv("dummy.csv")
 
+        # The file is streamed line by line, never read whole
+        mocked_open.return_value.read.assert_not_called()
+
         assert "AA:BB:CC:DD:EE:FF" in networks
         assert networks["AA:BB:CC:DD:EE:FF"]["essid"] == "MyWiFi"
         assert "11:22:33:44:55:66" in clients
@@ -103,6 +109,7 @@ async def test_start_scan_execution(client, mock_app_module):
         cmd = args[0]
         assert "-c" in cmd and "6" in cmd
         assert "wlan0mon" in cmd
+        assert cmd[cmd.index("--write-interval") + 1] == "1"
 
 async def test_stop_scan(client, mock_app_module):
     """Test terminating the scanning process."""
@@ -128,7 +135,6 @@ async def test_send_deauth_success(client, mock_app_module):
             'interface': 'wlan0mon'
         }
         response = await client.post('/wifi/deauth', json=payload)
-        data = await response.get_json()
 
         assert response.status_code == 200
         args, _ = mock_run.call_args
@@ -4,6 +4,7 @@ HTTP client for communicating with remote Valentine RF agents.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -11,6 +12,53 @@ import httpx
 
 logger = logging.getLogger('valentine.agent_client')
 
+# Shared connection pool so repeated agent calls reuse keep-alive connections
+# instead of paying TCP (and TLS) setup on every request.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+_stale_closes: set[asyncio.Task] = set()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient for the running event loop.
+
+    A client's pooled connections are bound to the loop that opened them,
+    so a new client is created if the loop has changed.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        if _http_client is not None and not _http_client.is_closed:
+            _close_stale_client(_http_client)
+        _http_client = httpx.AsyncClient(limits=_HTTP_LIMITS)
+        _http_client_loop = loop
+    return _http_client
+
+
+def _close_stale_client(client: httpx.AsyncClient) -> None:
+    """Schedule aclose() for a client left behind by a previous event loop."""
+    task = asyncio.get_running_loop().create_task(client.aclose())
+    _stale_closes.add(task)
+    task.add_done_callback(_stale_close_done)
+
+
+def _stale_close_done(task: asyncio.Task) -> None:
+    _stale_closes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # Sockets bound to a closed loop cannot shut down cleanly
+        logger.debug(f"Stale HTTP client did not close cleanly: {task.exception()}")
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (call on application shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
 
 class AgentHTTPError(RuntimeError):
     """Exception raised when agent HTTP request fails."""
@@ -32,7 +80,8 @@ class AgentClient:
         self,
         base_url: str,
         api_key: str | None = None,
-        timeout: float = 60.0
+        timeout: float = 60.0,
+        http_client: httpx.AsyncClient | None = None
     ):
         """
         Initialize agent client.
@@ -41,10 +90,16 @@ class AgentClient:
             base_url: Base URL of the agent (e.g., http://192.168.1.50:8020)
             api_key: Optional API key for authentication
             timeout: Request timeout in seconds
+            http_client: Optional AsyncClient to use instead of the shared pool
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.timeout = timeout
+        self._http_client = http_client
+
+    def _client(self) -> httpx.AsyncClient:
+        """Get the AsyncClient used for requests."""
+        return self._http_client or get_http_client()
 
     def _headers(self) -> dict:
         """Get request headers."""
@@ -70,13 +125,12 @@ class AgentClient:
         """
         url = f"{self.base_url}{path}"
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._headers(),
-                    params=params,
-                    timeout=self.timeout
-                )
+            response = await self._client().get(
+                url,
+                headers=self._headers(),
+                params=params,
+                timeout=self.timeout
+            )
             response.raise_for_status()
             return response.json() if response.content else {}
         except httpx.ConnectError as e:
@@ -115,13 +169,12 @@ class AgentClient:
         """
         url = f"{self.base_url}{path}"
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=data or {},
-                    headers=self._headers(),
-                    timeout=self.timeout
-                )
+            response = await self._client().post(
+                url,
+                json=data or {},
+                headers=self._headers(),
+                timeout=self.timeout
+            )
             response.raise_for_status()
             return response.json() if response.content else {}
         except httpx.ConnectError as e:
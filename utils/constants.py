@@ -111,6 +111,9 @@ GPS_QUEUE_MAX_SIZE = 100
 # WiFi CSV parse interval (seconds)
 WIFI_CSV_PARSE_INTERVAL = 2.0
 
+# How often airodump-ng rewrites its CSV (seconds); its own default is 5
+WIFI_CSV_WRITE_INTERVAL = 1
+
 # Minimum time before warning about no CSV data
 WIFI_CSV_TIMEOUT_WARNING = 5.0
 
@@ -8,11 +8,12 @@ import json
 import logging
 import sqlite3
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from werkzeug.security import generate_password_hash
 from config import ADMIN_USERNAME, ADMIN_PASSWORD
+from utils import json_codec
 
 logger = logging.getLogger('valentine.database')
 
@@ -542,6 +543,16 @@ def init_db() -> None:
             )
         ''')
 
+        # Change counters behind the payload-listing ETags, kept in the
+        # database so every process sees writes made by the others.
+        # agent_id 0 counts writes for any agent, -1 counts cleanups.
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS payload_versions (
+                agent_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+
         # Indexes for agent tables
         conn.execute('''
             CREATE INDEX IF NOT EXISTS idx_agents_name
@@ -553,6 +564,18 @@ def init_db() -> None:
             ON push_payloads(agent_id, received_at)
         ''')
 
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_push_payloads_scan_type
+            ON push_payloads(scan_type, received_at)
+        ''')
+
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_push_payloads_received_at
+            ON push_payloads(received_at)
+        ''')
+
+        _normalize_legacy_received_at(conn)
+
         logger.info("Database initialized successfully")
 
 
@@ -1970,6 +1993,41 @@ def cleanup_old_dsc_alerts(max_age_days: int = 30) -> int:
 # Remote Agent Functions (for distributed/controller mode)
 # =============================================================================
 
+# payload_versions keys for writes by any agent and for cleanup deletes
+_ANY_AGENT_VERSION_KEY = 0
+_CLEANUP_VERSION_KEY = -1
+
+
+def _bump_payload_versions(conn: sqlite3.Connection, keys) -> None:
+    """Record, in the caller's transaction, that payloads under these keys changed."""
+    conn.executemany('''
+        INSERT INTO payload_versions (agent_id, version) VALUES (?, 1)
+        ON CONFLICT(agent_id) DO UPDATE SET version = version + 1
+    ''', [(key,) for key in keys])
+
+
+def get_payload_version(agent_id: int | None = None) -> int:
+    """
+    Get a counter that increases whenever an agent's payloads change.
+
+    The counters live in the database and are updated in the same
+    transaction as the payload writes, so they hold across processes.
+
+    Args:
+        agent_id: Agent to check, or None for payloads from any agent
+
+    Returns:
+        Monotonic version number
+    """
+    key = _ANY_AGENT_VERSION_KEY if agent_id is None else agent_id
+    with get_db() as conn:
+        row = conn.execute('''
+            SELECT COALESCE(SUM(version), 0) FROM payload_versions
+            WHERE agent_id IN (?, ?)
+        ''', (key, _CLEANUP_VERSION_KEY)).fetchone()
+        return row[0]
+
+
 def create_agent(
     name: str,
     base_url: str,
@@ -2109,7 +2167,63 @@ def delete_agent(agent_id: int) -> bool:
         # Delete push payloads first (foreign key)
         conn.execute('DELETE FROM push_payloads WHERE agent_id = ?', (agent_id,))
         cursor = conn.execute('DELETE FROM agents WHERE id = ?', (agent_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+        _bump_payload_versions(conn, (_ANY_AGENT_VERSION_KEY, agent_id))
+    return deleted
+
+
+def normalize_payload_timestamp(value: str) -> str:
+    """
+    Normalize an ISO-8601 timestamp to SQLite's UTC 'YYYY-MM-DD HH:MM:SS' form.
+
+    Keeping every received_at in the same form as CURRENT_TIMESTAMP means
+    string order matches time order, so range filters can seek the index.
+
+    Raises:
+        ValueError: If the timestamp cannot be parsed
+    """
+    dt = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _payload_received_at(value: Any) -> str | None:
+    """
+    Normalize an agent-supplied received_at.
+
+    Returns None for missing, non-string (e.g. a Unix epoch number) or
+    unparseable values, so the row falls back to CURRENT_TIMESTAMP rather
+    than storing a string that would sort out of time order.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return normalize_payload_timestamp(value)
+    except ValueError:
+        return None
+
+
+# Matches received_at values already in normalized 'YYYY-MM-DD HH:MM:SS' form
+_NORMALIZED_RECEIVED_AT_GLOB = (
+    '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+)
+
+
+def _normalize_legacy_received_at(conn: sqlite3.Connection) -> None:
+    """Rewrite received_at values stored before timestamps were normalized."""
+    rows = conn.execute('''
+        SELECT id, received_at FROM push_payloads
+        WHERE received_at IS NULL OR received_at NOT GLOB ?
+    ''', (_NORMALIZED_RECEIVED_AT_GLOB,)).fetchall()
+    if not rows:
+        return
+
+    conn.executemany(
+        'UPDATE push_payloads SET received_at = COALESCE(?, CURRENT_TIMESTAMP) WHERE id = ?',
+        [(_payload_received_at(row['received_at']), row['id']) for row in rows]
+    )
+    logger.info(f"Normalized received_at on {len(rows)} push payloads")
 
 
 def store_push_payload(
@@ -2125,17 +2239,18 @@ def store_push_payload(
     Returns:
         The ID of the created payload record
     """
+    received_at = _payload_received_at(received_at)
     with get_db() as conn:
         if received_at:
             cursor = conn.execute('''
                 INSERT INTO push_payloads (agent_id, scan_type, interface, payload, received_at)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (agent_id, scan_type, interface, json.dumps(payload), received_at))
+            ''', (agent_id, scan_type, interface, json_codec.dumps(payload), received_at))
         else:
             cursor = conn.execute('''
                 INSERT INTO push_payloads (agent_id, scan_type, interface, payload)
                 VALUES (?, ?, ?, ?)
-            ''', (agent_id, scan_type, interface, json.dumps(payload)))
+            ''', (agent_id, scan_type, interface, json_codec.dumps(payload)))
 
         # Update agent last_seen
         conn.execute(
@@ -2143,18 +2258,74 @@ def store_push_payload(
             (agent_id,)
         )
 
-        return cursor.lastrowid
+        payload_id = cursor.lastrowid
+        _bump_payload_versions(conn, (_ANY_AGENT_VERSION_KEY, agent_id))
+    return payload_id
+
+
+def store_push_payloads(records: list[dict]) -> list[int]:
+    """
+    Store a batch of push payloads in a single transaction.
+
+    Each record takes the same keys as store_push_payload() arguments
+    (agent_id, scan_type, payload, interface, received_at).
+
+    Returns:
+        The IDs of the created payload records, in input order
+    """
+    payload_ids = []
+    with get_db() as conn:
+        for record in records:
+            cursor = conn.execute('''
+                INSERT INTO push_payloads (agent_id, scan_type, interface, payload, received_at)
+                VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (
+                record['agent_id'],
+                record['scan_type'],
+                record.get('interface'),
+                json_codec.dumps(record.get('payload', {})),
+                _payload_received_at(record.get('received_at'))
+            ))
+            payload_ids.append(cursor.lastrowid)
+
+        # Update last_seen once per agent in the batch
+        conn.executemany(
+            'UPDATE agents SET last_seen = CURRENT_TIMESTAMP WHERE id = ?',
+            [(agent_id,) for agent_id in {r['agent_id'] for r in records}]
+        )
+
+        _bump_payload_versions(
+            conn, (_ANY_AGENT_VERSION_KEY, *{r['agent_id'] for r in records})
+        )
+    return payload_ids
 
 
 def get_recent_payloads(
     agent_id: int | None = None,
     scan_type: str | None = None,
-    limit: int = 100
+    limit: int = 100,
+    since: str | None = None
 ) -> list[dict]:
-    """Get recent push payloads, optionally filtered."""
+    """
+    Get recent push payloads, optionally filtered.
+
+    Args:
+        agent_id: Only payloads from this agent
+        scan_type: Only payloads of this scan type
+        limit: Maximum number of payloads to return
+        since: Only payloads received at or after this ISO-8601 timestamp
+
+    Raises:
+        ValueError: If since cannot be parsed
+    """
     conditions = []
     params = []
 
+    if since is not None:
+        # Range condition on received_at seeks the index instead of scanning
+        conditions.append('p.received_at >= ?')
+        params.append(normalize_payload_timestamp(since))
+
     if agent_id is not None:
         conditions.append('p.agent_id = ?')
         params.append(agent_id)
@@ -2183,7 +2354,7 @@ def get_recent_payloads(
                 'agent_name': row['agent_name'],
                 'scan_type': row['scan_type'],
                 'interface': row['interface'],
-                'payload': json.loads(row['payload']),
+                'payload': json_codec.loads(row['payload']),
                 'received_at': row['received_at']
             })
         return results
@@ -2196,5 +2367,9 @@ def cleanup_old_payloads(max_age_hours: int = 24) -> int:
             DELETE FROM push_payloads
             WHERE received_at < datetime('now', ?)
         ''', (f'-{max_age_hours} hours',))
-        return cursor.rowcount
+        removed = cursor.rowcount
+        if removed:
+            # Deletes can touch any agent, so they count towards every version
+            _bump_payload_versions(conn, (_CLEANUP_VERSION_KEY,))
+    return removed
 
@@ -4,6 +4,7 @@ import logging
 import os
 import shutil
 import subprocess
+import time
 from typing import Any
 
 logger = logging.getLogger('valentine.dependencies')
@@ -11,6 +12,13 @@ logger = logging.getLogger('valentine.dependencies')
 # Additional paths to search for tools (e.g., /usr/sbin on Debian)
 EXTRA_TOOL_PATHS = ['/usr/sbin', '/sbin']
 
+# How long a tool lookup (hit or miss) is reused before PATH is searched again.
+# Short enough that a tool installed while the app is running shows up quickly.
+TOOL_PATH_CACHE_TTL = 30.0
+
+# name -> (monotonic timestamp, resolved path or None)
+_tool_path_cache: dict[str, tuple[float, str | None]] = {}
+
 
 def check_tool(name: str) -> bool:
     """Check if a tool is installed."""
@@ -18,7 +26,28 @@ def check_tool(name: str) -> bool:
 
 
 def get_tool_path(name: str) -> str | None:
-    """Get the full path to a tool, checking standard PATH and extra locations."""
+    """Get the full path to a tool, checking standard PATH and extra locations.
+
+    Results are cached for TOOL_PATH_CACHE_TTL seconds; each uncached lookup
+    stats every PATH directory.
+    """
+    now = time.monotonic()
+    cached = _tool_path_cache.get(name)
+    if cached is not None and now - cached[0] < TOOL_PATH_CACHE_TTL:
+        return cached[1]
+
+    path = _find_tool_path(name)
+    _tool_path_cache[name] = (now, path)
+    return path
+
+
+def clear_tool_cache() -> None:
+    """Forget cached tool lookups (e.g. after installing a tool)."""
+    _tool_path_cache.clear()
+
+
+def _find_tool_path(name: str) -> str | None:
+    """Search PATH and EXTRA_TOOL_PATHS for a tool."""
     # First check standard PATH
     path = shutil.which(name)
     if path:
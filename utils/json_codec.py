@@ -0,0 +1,47 @@
+"""
+JSON encode/decode helpers for hot paths (agent push ingestion, payload queries).
+
+Framework-free so the database layer and the standalone agent can use it
+without Quart; the app-wide Quart provider lives in utils.quart_json.
+
+Uses orjson when installed and falls back to the standard library otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# orjson is optional - parses and serializes in C, several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON document.
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as a JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj)
@@ -128,15 +128,33 @@ def cleanup_stale_processes() -> None:
             pass
 
 
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+
 def is_valid_mac(mac: str | None) -> bool:
-    """Validate MAC address format."""
-    if not mac:
+    """Validate MAC address format (colon-separated, e.g. AA:BB:CC:DD:EE:FF)."""
+    if not isinstance(mac, str) or len(mac) != 17:
+        return False
+    if not (mac[2] == mac[5] == mac[8] == mac[11] == mac[14] == ':'):
         return False
-    return bool(re.match(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$', mac))
+    # Exactly five colons (the ones checked above) leave twelve hex digits
+    digits = mac.replace(':', '')
+    return len(digits) == 12 and _HEX_DIGITS.issuperset(digits)
 
 
 def is_valid_channel(channel: str | int | None) -> bool:
     """Validate WiFi channel number."""
+    # Fast paths for plain ints and digit strings; anything else (padded or
+    # signed strings, floats, None) keeps the int() conversion semantics
+    if type(channel) is int:
+        return 1 <= channel <= 200
+    if isinstance(channel, str):
+        if channel.isascii() and channel.isdigit():
+            return 1 <= int(channel) <= 200
+        # Reject strings int() can only fail on (or parse as negative)
+        # without raising and catching a ValueError
+        if not channel.strip().lstrip('+').replace('_', '').isdigit():
+            return False
     try:
         ch = int(channel)  # type: ignore[arg-type]
         return 1 <= ch <= 200
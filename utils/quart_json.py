@@ -0,0 +1,50 @@
+"""
+Quart JSON provider backed by the fast codec in utils.json_codec.
+
+Kept apart from json_codec so only the web app pays for the Quart import.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from quart.json.provider import DefaultJSONProvider
+
+from utils.json_codec import ORJSON_AVAILABLE, orjson
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Quart JSON provider that encodes/decodes with orjson when available.
+
+    Output matches DefaultJSONProvider: keys stay sorted, and datetimes and
+    dataclasses still go through the provider's ``default`` (RFC 822 dates,
+    ``asdict``). Calls with extra formatting options (e.g. ``indent`` in
+    debug mode) and values orjson rejects, such as integers wider than 64
+    bits, fall back to the standard library.
+
+    Unlike the standard library, orjson encodes NaN and Infinity as ``null``.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not ORJSON_AVAILABLE or set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        option = _ORJSON_PROVIDER_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+_ORJSON_PROVIDER_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+) if ORJSON_AVAILABLE else 0
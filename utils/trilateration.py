@@ -298,6 +298,13 @@ class Trilateration:
         initial_lat = sum(obs.agent_lat * w for obs, w in zip(valid_obs, weights)) / total_weight
         initial_lon = sum(obs.agent_lon * w for obs, w in zip(valid_obs, weights)) / total_weight
 
+        # Flatten anchors once so the refinement loop avoids per-iteration
+        # attribute lookups on the observation dataclasses
+        anchors = [
+            (obs.agent_lat, obs.agent_lon, expected_dist)
+            for obs, expected_dist in zip(valid_obs, distances)
+        ]
+
         # Iterative refinement using gradient descent
         current_lat, current_lon = initial_lat, initial_lon
 
@@ -307,10 +314,14 @@ class Trilateration:
             grad_lon = 0.0
             total_error = 0.0
 
-            for obs, expected_dist in zip(valid_obs, distances):
+            # Scale factor for lat/lon to meters (constant within an iteration)
+            lat_scale = 111000.0
+            lon_scale = 111000.0 * math.cos(math.radians(current_lat))
+
+            for agent_lat, agent_lon, expected_dist in anchors:
                 actual_dist = haversine_distance(
                     current_lat, current_lon,
-                    obs.agent_lat, obs.agent_lon
+                    agent_lat, agent_lon
                 )
 
                 error = actual_dist - expected_dist
@@ -318,12 +329,8 @@ class Trilateration:
 
                 if actual_dist > 0.1:  # Avoid division by zero
                     # Gradient components
-                    lat_diff = current_lat - obs.agent_lat
-                    lon_diff = current_lon - obs.agent_lon
-
-                    # Scale factor for lat/lon to meters
-                    lat_scale = 111000.0
-                    lon_scale = 111000.0 * math.cos(math.radians(current_lat))
+                    lat_diff = current_lat - agent_lat
+                    lon_diff = current_lon - agent_lon
 
                     grad_lat += error * (lat_diff * lat_scale) / actual_dist
                     grad_lon += error * (lon_diff * lon_scale) / actual_dist
@@ -350,10 +357,10 @@ class Trilateration:
 
         # Calculate accuracy estimate (average distance error)
         total_error = 0.0
-        for obs, expected_dist in zip(valid_obs, distances):
+        for agent_lat, agent_lon, expected_dist in anchors:
             actual_dist = haversine_distance(
                 current_lat, current_lon,
-                obs.agent_lat, obs.agent_lon
+                agent_lat, agent_lon
             )
             total_error += abs(actual_dist - expected_dist)
 
@@ -411,8 +418,8 @@ class DeviceLocationTracker:
         self.observation_window = observation_window_seconds
         self.min_observations = min_observations
 
-        # device_id -> list of AgentObservation
-        self.observations: dict[str, List[AgentObservation]] = {}
+        # device_id -> agent_name -> latest AgentObservation from that agent
+        self.observations: dict[str, dict[str, AgentObservation]] = {}
 
         # device_id -> latest LocationEstimate
         self.locations: dict[str, LocationEstimate] = {}
@@ -451,10 +458,12 @@ class DeviceLocationTracker:
             timestamp=timestamp or datetime.now(timezone.utc)
         )
 
-        if device_id not in self.observations:
-            self.observations[device_id] = []
-
-        self.observations[device_id].append(obs)
+        # Upsert keyed on (device_id, agent_name): only the most recent
+        # observation per agent is used, so older ones need not be kept.
+        agent_obs = self.observations.setdefault(device_id, {})
+        existing = agent_obs.get(agent_name)
+        if existing is None or obs.timestamp >= existing.timestamp:
+            agent_obs[agent_name] = obs
 
         # Prune old observations
         self._prune_observations(device_id)
@@ -467,22 +476,17 @@ class DeviceLocationTracker:
         now = datetime.now(timezone.utc)
         cutoff = now.timestamp() - self.observation_window
 
-        self.observations[device_id] = [
-            obs for obs in self.observations[device_id]
-            if obs.timestamp.timestamp() > cutoff
-        ]
+        agent_obs = self.observations[device_id]
+        for agent_name in [
+            name for name, obs in agent_obs.items()
+            if obs.timestamp.timestamp() <= cutoff
+        ]:
+            del agent_obs[agent_name]
 
     def _update_location(self, device_id: str) -> Optional[LocationEstimate]:
         """Compute location estimate from current observations."""
-        obs_list = self.observations.get(device_id, [])
-
-        # Get unique agents (use most recent observation per agent)
-        agent_obs: dict[str, AgentObservation] = {}
-        for obs in obs_list:
-            if obs.agent_name not in agent_obs or obs.timestamp > agent_obs[obs.agent_name].timestamp:
-                agent_obs[obs.agent_name] = obs
-
-        unique_observations = list(agent_obs.values())
+        # Observations are already unique per agent (most recent wins)
+        unique_observations = list(self.observations.get(device_id, {}).values())
 
         if len(unique_observations) < self.min_observations:
             return None
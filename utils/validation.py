@@ -150,12 +150,15 @@ def validate_wifi_channel(channel: Any) -> int:
         raise ValueError(f"Invalid WiFi channel: {channel}") from e
 
 
+_MAC_ADDRESS_RE = re.compile(r'[0-9A-F]{2}(?::[0-9A-F]{2}){5}')
+
+
 def validate_mac_address(mac: Any) -> str:
     """Validate and return MAC address."""
     if not mac or not isinstance(mac, str):
         raise ValueError("MAC address is required")
     mac = mac.upper().strip()
-    if not re.match(r'^([0-9A-F]{2}:){5}[0-9A-F]{2}$', mac):
+    if not _MAC_ADDRESS_RE.fullmatch(mac):
         raise ValueError(f"Invalid MAC address format: {mac}")
     return mac
 
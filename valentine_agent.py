@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import argparse
 import configparser
+import contextlib
 import json
 import logging
 import os
@@ -253,6 +254,8 @@ class ControllerPushClient(threading.Thread):
         self.queue: queue.Queue = queue.Queue(maxsize=200)
         self.running = False
         self.stop_event = threading.Event()
+        # Controller-assigned ID, learned from the first accepted push
+        self.agent_id: int | None = None
 
     def enqueue(self, scan_type: str, payload: dict, interface: str = None):
         """Add data to push queue."""
@@ -301,11 +304,20 @@ class ControllerPushClient(threading.Thread):
                 'payload': item['payload'],
                 'received_at': item['received_at'],
             }
+            if self.agent_id is not None:
+                body['agent_id'] = self.agent_id
 
             try:
                 response = httpx.post(endpoint, json=body, headers=headers, timeout=5)
+                if response.status_code == 401:
+                    # Agent may have been re-registered; fall back to name lookup
+                    self.agent_id = None
                 if response.status_code >= 400:
                     raise RuntimeError(f"HTTP {response.status_code}")
+                if self.agent_id is None:
+                    # Non-JSON or non-object bodies leave the name lookup in place
+                    with contextlib.suppress(ValueError, AttributeError):
+                        self.agent_id = response.json().get('agent_id')
                 logger.debug(f"Pushed {item['scan_type']} data to controller")
             except Exception as e:
                 item['attempts'] += 1